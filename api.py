@@ -1,12 +1,24 @@
 from flask import Blueprint, jsonify, request
 from src.models.bank import Bank
 from src.models.monthly_statistic import MonthlyStatistic
+from src.models.metric_growth import MetricGrowth
 from src.models.db import db
+from src.utils.scraper import STAT_FIELDS
 from datetime import datetime
 import calendar
 
 api_bp = Blueprint('api', __name__)
 
+def metric_formatter(column):
+    """Serialise values of a monthly_statistics column the way MonthlyStatistic.to_dict does"""
+    if isinstance(column.type, db.DateTime):
+        return lambda value: value.isoformat()
+    if isinstance(column.type, db.Date):
+        return lambda value: value.strftime('%Y-%m')
+    if isinstance(column.type, db.Numeric):
+        return lambda value: float(value) if value else None
+    return lambda value: value
+
 @api_bp.route('/banks', methods=['GET'])
 def get_banks():
     """Get all banks or filter by bank type"""
@@ -73,27 +85,33 @@ def get_statistics():
     if bank_type:
         query = query.filter(Bank.bank_type == bank_type)
     
-    # Execute query
-    statistics = query.all()
-    
-    # Filter by metric if specified
-    if metric and statistics:
+    # Project only the requested metric, with the bank name from the join
+    if metric:
+        column = MonthlyStatistic.__table__.columns.get(metric)
         result = []
-        for stat in statistics:
-            stat_dict = stat.to_dict()
-            if metric in stat_dict:
-                result.append({
-                    'bank_id': stat_dict['bank_id'],
-                    'bank_name': Bank.query.get(stat_dict['bank_id']).bank_name,
-                    'month': stat_dict['month'],
-                    metric: stat_dict[metric]
-                })
+        if column is not None:
+            format_value = metric_formatter(column)
+            rows = query.with_entities(
+                MonthlyStatistic.bank_id, Bank.bank_name, MonthlyStatistic.month, column
+            ).all()
+            result = [
+                {
+                    'bank_id': stat_bank_id,
+                    'bank_name': bank_name,
+                    'month': stat_month.strftime('%Y-%m'),
+                    metric: format_value(value)
+                }
+                for stat_bank_id, bank_name, stat_month, value in rows
+            ]
         return jsonify({
             'success': True,
             'count': len(result),
             'data': result
         })
     
+    # Execute query
+    statistics = query.all()
+    
     # Return all data if no metric specified
     return jsonify({
         'success': True,
@@ -103,7 +121,7 @@ def get_statistics():
 
 @api_bp.route('/analytics/growth', methods=['GET'])
 def get_growth_analytics():
-    """Calculate month-on-month growth for a specific metric"""
+    """Get month-on-month growth for a specific metric, precomputed at ingest"""
     # Parse query parameters
     metric = request.args.get('metric')
     bank_id = request.args.get('bank_id')
@@ -114,13 +132,16 @@ def get_growth_analytics():
     if not metric:
         return jsonify({'success': False, 'error': 'Metric parameter is required'}), 400
     
+    if metric not in STAT_FIELDS:
+        return jsonify({'success': False, 'error': f"Unknown metric. Use one of: {', '.join(STAT_FIELDS)}"}), 400
+    
     # Start with base query
-    query = db.session.query(MonthlyStatistic, Bank.bank_name).join(Bank)
+    query = db.session.query(MetricGrowth, Bank.bank_name).join(Bank).filter(MetricGrowth.metric == metric)
     
     # Apply filters
     if bank_id:
         try:
-            query = query.filter(MonthlyStatistic.bank_id == int(bank_id))
+            query = query.filter(MetricGrowth.bank_id == int(bank_id))
         except ValueError:
             return jsonify({'success': False, 'error': 'Invalid bank_id'}), 400
     
@@ -131,7 +152,8 @@ def get_growth_analytics():
         try:
             year, month_num = map(int, start_month.split('-'))
             start_date = datetime(year, month_num, 1)
-            query = query.filter(MonthlyStatistic.month >= start_date)
+            # Both months of the pair must be in range
+            query = query.filter(MetricGrowth.previous_month >= start_date)
         except (ValueError, IndexError):
             return jsonify({'success': False, 'error': 'Invalid start_month format. Use YYYY-MM'}), 400
     
@@ -140,51 +162,22 @@ def get_growth_analytics():
             year, month_num = map(int, end_month.split('-'))
             last_day = calendar.monthrange(year, month_num)[1]
             end_date = datetime(year, month_num, last_day)
-            query = query.filter(MonthlyStatistic.month <= end_date)
+            query = query.filter(MetricGrowth.month <= end_date)
         except (ValueError, IndexError):
             return jsonify({'success': False, 'error': 'Invalid end_month format. Use YYYY-MM'}), 400
     
     # Order by bank and month
-    query = query.order_by(MonthlyStatistic.bank_id, MonthlyStatistic.month)
+    query = query.order_by(MetricGrowth.bank_id, MetricGrowth.month)
     
-    # Execute query
-    results = query.all()
-    
-    # Calculate growth
+    # Group growth entries by bank
     growth_data = {}
-    for i in range(1, len(results)):
-        current = results[i][0]
-        previous = results[i-1][0]
-        
-        # Skip if not the same bank
-        if current.bank_id != previous.bank_id:
-            continue
-        
-        # Get metric values
-        current_value = getattr(current, metric, 0) or 0
-        previous_value = getattr(previous, metric, 0) or 0
-        
-        # Calculate growth percentage
-        growth_pct = 0
-        if previous_value > 0:
-            growth_pct = ((current_value - previous_value) / previous_value) * 100
-        
-        # Format month
-        month_str = current.month.strftime('%Y-%m')
-        
-        # Add to growth data
-        if current.bank_id not in growth_data:
-            growth_data[current.bank_id] = {
-                'bank_name': results[i][1],
+    for growth, bank_name in query.all():
+        if growth.bank_id not in growth_data:
+            growth_data[growth.bank_id] = {
+                'bank_name': bank_name,
                 'growth': []
             }
-        
-        growth_data[current.bank_id]['growth'].append({
-            'month': month_str,
-            'value': current_value,
-            'previous_value': previous_value,
-            'growth_percentage': round(growth_pct, 2)
-        })
+        growth_data[growth.bank_id]['growth'].append(growth.to_dict())
     
     return jsonify({
         'success': True,
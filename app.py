@@ -1,9 +1,14 @@
 import os
+import time
 import pandas as pd
 import json
-from flask import Flask, render_template, jsonify, request, redirect, url_for
+from flask import Flask, render_template, jsonify, request, redirect, url_for, g
 from datetime import datetime
 import logging
+from dashboard_data import build_rollup, rollup_totals, build_indexes, filter_rows, compact_frame, memory_report, build_growth, average_growth_by_month, PanelTimer
+from response_cache import response_cache
+from frame_cache import FrameCache, source_signature
+from dataset import DatasetStore
 
 # Configure logging
 logging.basicConfig(
@@ -25,78 +30,145 @@ ALL_DATA_PATH = os.path.join(DATA_DIR, "all_rbi_data.csv")
 CREDIT_CARD_PATH = os.path.join(DATA_DIR, "credit_card_data.csv")
 DEBIT_CARD_PATH = os.path.join(DATA_DIR, "debit_card_data.csv")
 BANK_TYPES_PATH = os.path.join(DATA_DIR, "bank_types.csv")
+FRAME_CACHE_DIR = os.path.join(DATA_DIR, "frame_cache")
 
-# Global data storage
-data = {
-    'all_data': None,
-    'credit_card_data': None,
-    'debit_card_data': None,
-    'bank_types': None,
-    'last_updated': None
+# Source CSV of every loaded frame
+CSV_PATHS = {
+    'all_data': ALL_DATA_PATH,
+    'credit_card_data': CREDIT_CARD_PATH,
+    'debit_card_data': DEBIT_CARD_PATH,
+    'bank_types': BANK_TYPES_PATH
 }
 
+# Frames of per-bank monthly statistics
+STATS_FRAMES = ('all_data', 'credit_card_data', 'debit_card_data')
+
+# Compact in-memory layout: categorical strings, downcast integers, no copied frames
+COMPACT_MODE = os.environ.get("RBI_COMPACT_MODE", "0") == "1"
+
+# Current dataset snapshot; load_data() builds a new one and swaps it in
+dataset = DatasetStore()
+response_cache.track(dataset)
+
+def read_csv_frames():
+    """Parse the CSV files into typed DataFrames"""
+    frames = {name: pd.read_csv(path) for name, path in CSV_PATHS.items()}
+    
+    # Convert month column to datetime
+    for df in frames.values():
+        if 'month' in df.columns:
+            df['month'] = pd.to_datetime(df['month'])
+    return frames
+
 def load_data():
-    """Load all data from CSV files"""
+    """Load all data from the Feather cache, or from CSV files when it is missing or stale"""
     try:
-        # Load all datasets
-        data['all_data'] = pd.read_csv(ALL_DATA_PATH)
-        data['credit_card_data'] = pd.read_csv(CREDIT_CARD_PATH)
-        data['debit_card_data'] = pd.read_csv(DEBIT_CARD_PATH)
-        data['bank_types'] = pd.read_csv(BANK_TYPES_PATH)
+        start = time.perf_counter()
+        frame_cache = FrameCache(FRAME_CACHE_DIR)
+        signature = source_signature(CSV_PATHS)
+        
+        frames = frame_cache.load(CSV_PATHS.keys(), signature)
+        source = 'feather'
+        if frames is None:
+            frames = read_csv_frames()
+            source = 'csv'
+            if frame_cache.save(frames, signature):
+                logger.info("Wrote Feather cache of the CSV data")
+        data = dict(frames)
+        
+        data['load_stats'] = {'source': source, 'seconds': round(time.perf_counter() - start, 3)}
+        logger.info(f"Loaded data from {source} in {data['load_stats']['seconds']}s")
         
-        # Convert month column to datetime
-        if 'month' in data['all_data'].columns:
-            data['all_data']['month'] = pd.to_datetime(data['all_data']['month'])
-        if 'month' in data['credit_card_data'].columns:
-            data['credit_card_data']['month'] = pd.to_datetime(data['credit_card_data']['month'])
-        if 'month' in data['debit_card_data'].columns:
-            data['debit_card_data']['month'] = pd.to_datetime(data['debit_card_data']['month'])
+        # Precompute monthly totals by bank type once per load
+        data['rollup'] = build_rollup(data['all_data'])
+        
+        # Precompute previous values and month-on-month growth of every metric once per load
+        data['growth'] = {name: build_growth(data[name]) for name in STATS_FRAMES}
+        
+        if COMPACT_MODE:
+            for name in STATS_FRAMES:
+                data[name] = compact_frame(data[name])
+        
+        # Index rows by bank type, bank and month for the filters
+        data['indexes'] = {
+            name: build_indexes(data[name])
+            for name in STATS_FRAMES
+        }
         
         # Set last updated timestamp
         data['last_updated'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
+        # Publish the new snapshot; responses cached for the previous version can no longer be served, so drop them
+        dataset.publish(data)
+        response_cache.invalidate()
+        
         logger.info("Data loaded successfully")
+        log_memory_report(data)
         return True
     except Exception as e:
         logger.error(f"Error loading data: {str(e)}")
         return False
 
+def data_frames(data):
+    """Loaded DataFrames by name"""
+    frames = {name: data[name] for name in ('all_data', 'credit_card_data', 'debit_card_data', 'bank_types', 'rollup')}
+    frames.update({name + '_growth': data['growth'][name] for name in STATS_FRAMES})
+    return frames
+
+def log_memory_report(data):
+    """Log the memory held by each loaded DataFrame"""
+    report = memory_report(data_frames(data))
+    sizes = {
+        name: f"{frame['total_bytes'] / 1024 / 1024:.2f} MB" if 'total_bytes' in frame else f"shared with {frame['shared_with']}"
+        for name, frame in report.items()
+    }
+    logger.info(f"Memory usage (compact mode {'on' if COMPACT_MODE else 'off'}): {sizes}")
+
+def current_data():
+    """Current dataset snapshot, loading it once if nothing is loaded yet"""
+    snapshot = dataset.get_or_load(load_data)
+    if snapshot is not None:
+        # Report the version this request actually read
+        g.dataset_version = snapshot.version
+    return snapshot
+
 def get_bank_types():
     """Get unique bank types"""
-    if data['all_data'] is not None and 'bank_type' in data['all_data'].columns:
-        return sorted(data['all_data']['bank_type'].unique().tolist())
+    data = dataset.current
+    if data is not None:
+        return data['indexes']['all_data']['sorted'].get('bank_type', [])
     return []
 
 def get_banks_by_type(bank_type=None):
     """Get banks filtered by type"""
-    if data['all_data'] is not None:
+    data = dataset.current
+    if data is not None:
+        indexes = data['indexes']['all_data']
         if bank_type and bank_type != 'All':
-            filtered = data['all_data'][data['all_data']['bank_type'] == bank_type]
-            return sorted(filtered['bank_name'].unique().tolist())
+            return indexes['banks_by_type'].get(bank_type, [])
         else:
-            return sorted(data['all_data']['bank_name'].unique().tolist())
+            return indexes['sorted'].get('bank_name', [])
     return []
 
 def get_months():
     """Get available months"""
-    if data['all_data'] is not None and 'month_str' in data['all_data'].columns:
-        return sorted(data['all_data']['month_str'].unique().tolist())
+    data = dataset.current
+    if data is not None:
+        return data['indexes']['all_data']['sorted'].get('month_str', [])
     return []
 
-def calculate_mom_growth(df, value_col):
-    """Calculate month-on-month growth for a specific metric"""
+def calculate_mom_growth(df, value_col, growth):
+    """Month-on-month growth for a specific metric, read from the load-time growth columns"""
     if df is None or len(df) == 0:
         return pd.DataFrame()
     
-    # Sort by month
+    # Sort by month; rows keep the labels they share with growth
     df = df.sort_values('month')
-    
-    # Group by bank and calculate growth
-    result = df.copy()
-    result['previous'] = result.groupby('bank_name')[value_col].shift(1)
-    result['growth'] = ((result[value_col] - result['previous']) / result['previous'] * 100).round(2)
-    
-    return result
+    rows = growth.loc[df.index]
+    return df.assign(
+        previous=rows[value_col + '_previous'].to_numpy(),
+        growth=rows[value_col + '_growth'].to_numpy()
+    )
 
 def check_for_updates():
     """Check if new data is available from RBI website"""
@@ -107,15 +179,81 @@ def check_for_updates():
     return {
         'new_data_available': False,
         'last_checked': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        'last_updated': data['last_updated']
+        'last_updated': dataset.current['last_updated'] if dataset.current else None
     }
 
+# Source frame and metric of each card type
+CARD_TYPES = {
+    'credit': ('credit_card_data', 'credit_cards'),
+    'debit': ('debit_card_data', 'debit_cards')
+}
+
+def card_data_frame(data, card_type, bank_type='All', bank_name='All', include_growth=False, view=None):
+    """Credit or debit card rows for the filters (or an already filtered view), optionally with growth"""
+    name, value_col = CARD_TYPES[card_type]
+    if view is None:
+        # Apply filters through the load-time indexes
+        view = filter_rows(data[name], data['indexes'][name], bank_type=bank_type, bank_name=bank_name)
+    df = view
+    
+    # Calculate growth if requested
+    if include_growth:
+        df = calculate_mom_growth(df, value_col, data['growth'][name])
+    return df
+
+def top_banks_frame(data, card_type, limit):
+    """Banks with the most credit or debit cards in the latest month"""
+    # Get the latest month data
+    latest_month = data['all_data']['month'].max()
+    latest_data = data['all_data'][data['all_data']['month'] == latest_month]
+    
+    # Sort by card count
+    if card_type.lower() == 'credit':
+        sorted_data = latest_data.sort_values('credit_cards', ascending=False, kind='stable')
+        return sorted_data[['bank_name', 'bank_type', 'credit_cards']].head(limit)
+    else:
+        sorted_data = latest_data.sort_values('debit_cards', ascending=False, kind='stable')
+        return sorted_data[['bank_name', 'bank_type', 'debit_cards']].head(limit)
+
+def trend_frame(data, card_type, bank_type='All'):
+    """Monthly credit or debit card totals for a bank type"""
+    # Read monthly totals from the rollup
+    if card_type.lower() == 'credit':
+        monthly_sum = rollup_totals(data['rollup'], ['credit_cards'], bank_type)
+        monthly_sum = monthly_sum.rename(columns={'credit_cards': 'value'})
+    else:
+        monthly_sum = rollup_totals(data['rollup'], ['debit_cards'], bank_type)
+        monthly_sum = monthly_sum.rename(columns={'debit_cards': 'value'})
+    
+    # Add card type for reference
+    monthly_sum['card_type'] = card_type
+    return monthly_sum
+
+def comparison_frame(data, bank_name='All'):
+    """Monthly credit and debit cards for one bank, or totals over all banks"""
+    if bank_name and bank_name != 'All':
+        # For single bank, show the actual values
+        df = filter_rows(data['all_data'], data['indexes']['all_data'], bank_name=bank_name)
+        return df[['month_str', 'credit_cards', 'debit_cards']]
+    else:
+        # For all banks, read monthly totals from the rollup
+        return rollup_totals(data['rollup'], ['credit_cards', 'debit_cards'])
+
+@app.after_request
+def add_dataset_version(response):
+    """Tell clients which dataset snapshot is current"""
+    version = g.get('dataset_version')
+    if version is None and dataset.current is not None:
+        version = dataset.current.version
+    if version is not None:
+        response.headers['X-Dataset-Version'] = str(version)
+    return response
+
 @app.route('/')
 def index():
     """Main dashboard page"""
     # Load data if not already loaded
-    if data['all_data'] is None:
-        load_data()
+    data = current_data()
     
     # Get filter options
     bank_types = get_bank_types()
@@ -124,7 +262,7 @@ def index():
     return render_template('index.html', 
                           bank_types=bank_types,
                           months=months,
-                          last_updated=data['last_updated'])
+                          last_updated=data['last_updated'] if data else None)
 
 @app.route('/api/banks')
 def get_banks():
@@ -134,134 +272,127 @@ def get_banks():
     return jsonify(banks)
 
 @app.route('/api/credit_card_data')
+@response_cache.cached(bank_type='All', bank_name='All', include_growth='false')
 def get_credit_card_data():
     """API endpoint to get credit card data with filters"""
     bank_type = request.args.get('bank_type', 'All')
     bank_name = request.args.get('bank_name', 'All')
+    include_growth = request.args.get('include_growth', 'false').lower() == 'true'
     
-    if data['credit_card_data'] is None:
-        load_data()
-    
-    df = data['credit_card_data']
-    
-    # Apply filters
-    if bank_type and bank_type != 'All':
-        df = df[df['bank_type'] == bank_type]
-    
-    if bank_name and bank_name != 'All':
-        df = df[df['bank_name'] == bank_name]
-    
-    # Calculate growth if requested
-    if request.args.get('include_growth', 'false').lower() == 'true':
-        df = calculate_mom_growth(df, 'credit_cards')
+    data = current_data()
+    df = card_data_frame(data, 'credit', bank_type, bank_name, include_growth)
     
     # Convert to dict for JSON response
     result = df.to_dict(orient='records')
     return jsonify(result)
 
 @app.route('/api/debit_card_data')
+@response_cache.cached(bank_type='All', bank_name='All', include_growth='false')
 def get_debit_card_data():
     """API endpoint to get debit card data with filters"""
     bank_type = request.args.get('bank_type', 'All')
     bank_name = request.args.get('bank_name', 'All')
+    include_growth = request.args.get('include_growth', 'false').lower() == 'true'
     
-    if data['debit_card_data'] is None:
-        load_data()
-    
-    df = data['debit_card_data']
-    
-    # Apply filters
-    if bank_type and bank_type != 'All':
-        df = df[df['bank_type'] == bank_type]
-    
-    if bank_name and bank_name != 'All':
-        df = df[df['bank_name'] == bank_name]
-    
-    # Calculate growth if requested
-    if request.args.get('include_growth', 'false').lower() == 'true':
-        df = calculate_mom_growth(df, 'debit_cards')
+    data = current_data()
+    df = card_data_frame(data, 'debit', bank_type, bank_name, include_growth)
     
     # Convert to dict for JSON response
     result = df.to_dict(orient='records')
     return jsonify(result)
 
 @app.route('/api/top_banks')
+@response_cache.cached(card_type='credit', limit='10')
 def get_top_banks():
     """API endpoint to get top banks by credit or debit cards"""
     card_type = request.args.get('card_type', 'credit')
     limit = int(request.args.get('limit', 10))
     
-    if data['all_data'] is None:
-        load_data()
-    
-    # Get the latest month data
-    latest_month = data['all_data']['month'].max()
-    latest_data = data['all_data'][data['all_data']['month'] == latest_month]
-    
-    # Sort by card count
-    if card_type.lower() == 'credit':
-        sorted_data = latest_data.sort_values('credit_cards', ascending=False)
-        result = sorted_data[['bank_name', 'bank_type', 'credit_cards']].head(limit)
-    else:
-        sorted_data = latest_data.sort_values('debit_cards', ascending=False)
-        result = sorted_data[['bank_name', 'bank_type', 'debit_cards']].head(limit)
+    data = current_data()
+    result = top_banks_frame(data, card_type, limit)
     
     return jsonify(result.to_dict(orient='records'))
 
 @app.route('/api/trend_data')
+@response_cache.cached(card_type='credit', bank_type='All')
 def get_trend_data():
     """API endpoint to get trend data for charts"""
     card_type = request.args.get('card_type', 'credit')
     bank_type = request.args.get('bank_type', 'All')
     
-    if data['all_data'] is None:
-        load_data()
-    
-    df = data['all_data']
-    
-    # Apply bank type filter
-    if bank_type and bank_type != 'All':
-        df = df[df['bank_type'] == bank_type]
-    
-    # Group by month and sum
-    if card_type.lower() == 'credit':
-        monthly_sum = df.groupby('month_str')['credit_cards'].sum().reset_index()
-        monthly_sum = monthly_sum.rename(columns={'credit_cards': 'value'})
-    else:
-        monthly_sum = df.groupby('month_str')['debit_cards'].sum().reset_index()
-        monthly_sum = monthly_sum.rename(columns={'debit_cards': 'value'})
-    
-    # Add card type for reference
-    monthly_sum['card_type'] = card_type
+    data = current_data()
+    monthly_sum = trend_frame(data, card_type, bank_type)
     
     return jsonify(monthly_sum.to_dict(orient='records'))
 
 @app.route('/api/comparison_data')
+@response_cache.cached(bank_name='All')
 def get_comparison_data():
     """API endpoint to get comparison data between credit and debit cards"""
     bank_name = request.args.get('bank_name', 'All')
     
-    if data['all_data'] is None:
-        load_data()
-    
-    df = data['all_data']
+    data = current_data()
+    monthly_data = comparison_frame(data, bank_name)
     
-    # Apply bank filter
-    if bank_name and bank_name != 'All':
-        df = df[df['bank_name'] == bank_name]
+    return jsonify(monthly_data.to_dict(orient='records'))
+
+@app.route('/api/dashboard')
+@response_cache.cached(bank_type='All', bank_name='All', limit='10')
+def get_dashboard():
+    """
+    API endpoint to get every dashboard panel for one filter set in a single
+    response, with the server-side compute time of each panel
+    """
+    bank_type = request.args.get('bank_type', 'All')
+    bank_name = request.args.get('bank_name', 'All')
+    limit = int(request.args.get('limit', 10))
     
-    # Group by month
-    if bank_name and bank_name != 'All':
-        # For single bank, show the actual values
-        monthly_data = df[['month_str', 'credit_cards', 'debit_cards']]
-    else:
-        # For all banks, sum by month
-        monthly_data = df.groupby('month_str').agg({
-            'credit_cards': 'sum',
-            'debit_cards': 'sum'
-        }).reset_index()
+    data = current_data()
+    timer = PanelTimer()
+    
+    # Filter each card frame once; its overview and growth panels share the view
+    with timer('filter'):
+        views = {
+            card_type: filter_rows(data[name], data['indexes'][name], bank_type=bank_type, bank_name=bank_name)
+            for card_type, (name, _) in CARD_TYPES.items()
+        }
+    
+    panels = {}
+    for card_type in ('credit', 'debit'):
+        value_col = card_type + '_cards'
+        with timer(card_type + '_total'):
+            df = card_data_frame(data, card_type, view=views[card_type])
+            panels['total_' + value_col] = int(df[value_col].sum())
+        with timer(card_type + '_trend'):
+            panels[card_type + '_trend'] = trend_frame(data, card_type, bank_type).to_dict(orient='records')
+        with timer(card_type + '_top_banks'):
+            panels[card_type + '_top_banks'] = top_banks_frame(data, card_type, limit).to_dict(orient='records')
+        with timer(card_type + '_growth'):
+            df = card_data_frame(data, card_type, include_growth=True, view=views[card_type])
+            panels[card_type + '_growth'] = average_growth_by_month(df).to_dict(orient='records')
+    with timer('comparison'):
+        panels['comparison'] = comparison_frame(data, bank_name).to_dict(orient='records')
     
-    return jsonify(monthly_data.to_dict(orient='records'))
+    return jsonify({
+        'filters': {'bank_type': bank_type, 'bank_name': bank_name},
+        'panels': panels,
+        'timings_ms': timer.timings,
+        'dataset_version': data.version
+    })
+
+@app.route('/api/cache_stats')
+def get_cache_stats():
+    """API endpoint to get response cache statistics"""
+    return jsonify(response_cache.stats())
+
+@app.route('/api/admin/memory')
+def get_memory_report():
+    """API endpoint to get memory usage of the loaded data"""
+    data = current_data()
+    return jsonify({
+        'compact_mode': COMPACT_MODE,
+        'frames': memory_report(data_frames(data))
+    })
 
 @app.route('/api/check_updates')
 def api_check_updates():
@@ -272,10 +403,12 @@ def api_check_updates():
 @app.route('/api/refresh_data')
 def refresh_data():
     """API endpoint to manually refresh data"""
-    success = load_data()
+    success = dataset.reload(load_data)
+    data = dataset.current
     return jsonify({
         'success': success,
-        'last_updated': data['last_updated'] if success else None
+        'last_updated': data['last_updated'] if success else None,
+        'dataset_version': data.version if data else None
     })
 
 if __name__ == '__main__':
@@ -26,6 +26,8 @@ app = Flask(__name__)
 DB_PATH = os.path.join(os.getcwd(), "rbi_card_stats.db")
 DATA_DIR = os.path.join(os.getcwd(), "Processed_Data")
 EXCEL_DIR = os.path.join(os.getcwd(), "RBI_ATM_Excel")
+PARSE_CACHE_DIR = os.path.join(DATA_DIR, "parse_cache")
+PARSER_WORKERS = int(os.environ.get("PARSER_WORKERS", "1"))
 
 os.makedirs(DATA_DIR, exist_ok=True)
 os.makedirs(EXCEL_DIR, exist_ok=True)
@@ -106,9 +108,9 @@ def load_data_from_db():
 
 def process_and_store_excel_files():
     try:
-        parser = RBIExcelParser(excel_dir=EXCEL_DIR)
-        all_data = parser.process_all_files()
-        if not all_data:
+        parser = RBIExcelParser(excel_dir=EXCEL_DIR, workers=PARSER_WORKERS, cache_dir=PARSE_CACHE_DIR)
+        batches = parser.process_all_batches()
+        if not batches:
             logger.warning("No data processed from Excel files")
             return False
 
@@ -117,14 +119,10 @@ def process_and_store_excel_files():
         conn.execute("BEGIN TRANSACTION")
 
         records_added = 0
-        for df in all_data:
-            for _, row in df.iterrows():
-                bank_name = row['Bank Name']
-                credit_cards = int(row['Credit Cards Outstanding']) if pd.notna(row['Credit Cards Outstanding']) else 0
-                debit_cards = int(row['Debit Cards Outstanding']) if pd.notna(row['Debit Cards Outstanding']) else 0
-                month = row['Month']
-                month_str = row['Month_Str']
-
+        for df in batches:
+            months = df["month"].dt.strftime("%Y-%m-%d")
+            rows = zip(df["bank_name"], months, df["month_str"], df["credit_cards"], df["debit_cards"])
+            for bank_name, month, month_str, credit_cards, debit_cards in rows:
                 cursor.execute("INSERT OR IGNORE INTO banks (bank_name, bank_type) VALUES (?, ?)", (bank_name, "Unknown"))
                 cursor.execute("SELECT id FROM banks WHERE bank_name = ?", (bank_name,))
                 bank_id = cursor.fetchone()[0]
@@ -133,13 +131,17 @@ def process_and_store_excel_files():
                 INSERT OR REPLACE INTO monthly_stats
                 (bank_id, month, month_str, credit_cards, debit_cards)
                 VALUES (?, ?, ?, ?, ?)
-                """, (bank_id, month, month_str, credit_cards, debit_cards))
+                """, (
+                    bank_id, month, month_str,
+                    int(credit_cards) if pd.notna(credit_cards) else 0,
+                    int(debit_cards) if pd.notna(debit_cards) else 0
+                ))
                 records_added += 1
 
         cursor.execute("""
         INSERT INTO updates (check_time, update_time, new_data_available, files_added)
         VALUES (?, ?, ?, ?)
-        """, (datetime.now(), datetime.now(), 1, len(all_data)))
+        """, (datetime.now(), datetime.now(), 1, len(batches)))
 
         conn.commit()
         conn.close()
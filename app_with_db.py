@@ -1,12 +1,18 @@
 import os
 import json
-from flask import Flask, render_template, jsonify, request, redirect, url_for, send_file
+from flask import Flask, render_template, jsonify, request, redirect, url_for, send_file, g
 from datetime import datetime
 import logging
 import pandas as pd
 import sqlite3
 from update_checker import check_for_updates, download_updates
 from excel_parser import RBIExcelParser
+from parse_cache import file_sha256
+from stats_store import upsert_stats_batches, refresh_rollup, CREATE_ROLLUP_SQL, ensure_manifest, load_manifest, record_manifest, manifest_month
+from dashboard_data import rollup_totals, build_indexes, filter_rows, compact_frame, memory_report, select_columns, build_growth, average_growth_by_month, PanelTimer
+from response_cache import response_cache
+from dataset import DatasetStore
+from shared_snapshot import SharedSnapshot
 
 # Configure logging
 logging.basicConfig(
@@ -28,6 +34,22 @@ DB_PATH = os.path.join(os.getcwd(), "rbi_card_stats.db")
 # Data paths
 DATA_DIR = os.path.join(os.getcwd(), "Processed_Data")
 EXCEL_DIR = os.path.join(os.getcwd(), "RBI_ATM_Excel")
+PARSE_CACHE_DIR = os.path.join(DATA_DIR, "parse_cache")
+
+# Worker processes used to parse Excel files (1 = serial)
+PARSER_WORKERS = int(os.environ.get("PARSER_WORKERS", "1"))
+
+# Compact in-memory layout: categorical strings, downcast integers, no copied frames
+COMPACT_MODE = os.environ.get("RBI_COMPACT_MODE", "0") == "1"
+
+# Directory of a memory-mapped snapshot shared by all worker processes (unset = each worker loads its own)
+SHARED_SNAPSHOT_DIR = os.environ.get("RBI_SHARED_SNAPSHOT_DIR")
+
+# Frames stored in the shared snapshot; everything else is derived per worker
+SHARED_FRAMES = ('all_data', 'banks', 'rollup', 'growth')
+
+CREDIT_CARD_COLUMNS = ['month', 'month_str', 'bank_name', 'bank_type', 'credit_cards']
+DEBIT_CARD_COLUMNS = ['month', 'month_str', 'bank_name', 'bank_type', 'debit_cards']
 
 # Ensure directories exist
 os.makedirs(DATA_DIR, exist_ok=True)
@@ -84,6 +106,38 @@ def init_db():
         )
         ''')
         
+        # Create ingested_files table (manifest of Excel files already loaded)
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS ingested_files (
+            file_name TEXT PRIMARY KEY,
+            mtime REAL NOT NULL,
+            size INTEGER NOT NULL,
+            sha256 TEXT NOT NULL,
+            records INTEGER NOT NULL DEFAULT 0,
+            ingested_at TIMESTAMP NOT NULL,
+            error TEXT
+        )
+        ''')
+        
+        # Databases created before parse failures were recorded lack the error column
+        cursor.execute("PRAGMA table_info(ingested_files)")
+        if 'error' not in {row[1] for row in cursor.fetchall()}:
+            cursor.execute("ALTER TABLE ingested_files ADD COLUMN error TEXT")
+        
+        # Create ingest_manifest table (source URLs of ingested downloads)
+        ensure_manifest(conn)
+        
+        # Create monthly_rollup table (per-month totals by bank type)
+        cursor.execute(CREATE_ROLLUP_SQL)
+        
+        # Backfill the rollup for databases created before it existed
+        cursor.execute("SELECT EXISTS (SELECT 1 FROM monthly_rollup)")
+        rollup_populated = cursor.fetchone()[0]
+        cursor.execute("SELECT EXISTS (SELECT 1 FROM monthly_stats)")
+        if cursor.fetchone()[0] and not rollup_populated:
+            refresh_rollup(conn)
+            logger.info("Built monthly rollup from existing stats")
+        
         conn.commit()
         conn.close()
         logger.info("Database initialized successfully")
@@ -111,6 +165,13 @@ def load_data_from_db():
         # Convert month to datetime
         stats_df['month'] = pd.to_datetime(stats_df['month'])
         
+        # Precompute previous values and month-on-month growth of every metric once per load
+        growth_df = build_growth(stats_df)
+        
+        # Load precomputed monthly totals
+        rollup_df = pd.read_sql_query("SELECT * FROM monthly_rollup ORDER BY month, bank_type", conn)
+        rollup_df['month'] = pd.to_datetime(rollup_df['month'])
+        
         # Get last update time
         last_update_query = "SELECT update_time FROM updates WHERE update_time IS NOT NULL ORDER BY update_time DESC LIMIT 1"
         last_update = pd.read_sql_query(last_update_query, conn)
@@ -118,167 +179,392 @@ def load_data_from_db():
         
         conn.close()
         
-        # Create separate dataframes for credit and debit cards
-        credit_card_df = stats_df[['month', 'month_str', 'bank_name', 'bank_type', 'credit_cards']]
-        debit_card_df = stats_df[['month', 'month_str', 'bank_name', 'bank_type', 'debit_cards']]
-        
-        return {
-            'all_data': stats_df,
-            'credit_card_data': credit_card_df,
-            'debit_card_data': debit_card_df,
-            'banks': banks_df,
-            'last_updated': last_updated
-        }
+        return build_dataset({'all_data': stats_df, 'banks': banks_df, 'rollup': rollup_df, 'growth': growth_df}, last_updated)
     except Exception as e:
         logger.error(f"Error loading data from database: {str(e)}")
         return None
 
-def process_and_store_excel_files():
-    """Process Excel files and store data in the database"""
-    try:
-        # Initialize parser
-        parser = RBIExcelParser(excel_dir=EXCEL_DIR)
+def build_dataset(frames, last_updated, compact=COMPACT_MODE):
+    """Derive the card frames and lookup indexes from the stats, banks, rollup and growth frames"""
+    stats_df = frames['all_data']
+    if compact:
+        stats_df = compact_frame(stats_df)
+    
+    if COMPACT_MODE or SHARED_SNAPSHOT_DIR:
+        # Card endpoints select their columns from all_data instead of holding copies
+        credit_card_df = debit_card_df = stats_df
+    else:
+        # Create separate dataframes for credit and debit cards
+        credit_card_df = stats_df[CREDIT_CARD_COLUMNS]
+        debit_card_df = stats_df[DEBIT_CARD_COLUMNS]
+    
+    # Index rows by bank type, bank and month for the filters; the card
+    # frames share all_data's row positions
+    stats_indexes = build_indexes(stats_df)
+    
+    return {
+        'all_data': stats_df,
+        'credit_card_data': credit_card_df,
+        'debit_card_data': debit_card_df,
+        'banks': frames['banks'],
+        'rollup': frames['rollup'],
+        # The card frames share all_data's rows, so they share its growth too
+        'growth': {
+            'all_data': frames['growth'],
+            'credit_card_data': frames['growth'],
+            'debit_card_data': frames['growth']
+        },
+        'indexes': {
+            'all_data': stats_indexes,
+            'credit_card_data': stats_indexes,
+            'debit_card_data': stats_indexes
+        },
+        'last_updated': last_updated
+    }
+
+def get_changed_excel_files(conn, file_names):
+    """Return (file_name, mtime, size, sha256) for Excel files not yet ingested in their current form"""
+    cursor = conn.cursor()
+    cursor.execute("SELECT file_name, mtime, size, sha256 FROM ingested_files")
+    manifest = {row[0]: row[1:] for row in cursor.fetchall()}
+    
+    changed = []
+    for file_name in file_names:
+        file_stat = os.stat(os.path.join(EXCEL_DIR, file_name))
+        known = manifest.get(file_name)
         
-        # Process all files
-        all_data = parser.process_all_files()
+        # Same name, mtime and size: assume unchanged without hashing
+        if known and known[0] == file_stat.st_mtime and known[1] == file_stat.st_size:
+            continue
         
-        if not all_data:
-            logger.warning("No data processed from Excel files")
-            return False
+        sha256 = file_sha256(os.path.join(EXCEL_DIR, file_name))
+        if known and known[2] == sha256:
+            # Touched but identical content; just remember the new mtime
+            cursor.execute(
+                "UPDATE ingested_files SET mtime = ?, size = ? WHERE file_name = ?",
+                (file_stat.st_mtime, file_stat.st_size, file_name)
+            )
+            continue
+        
+        changed.append((file_name, file_stat.st_mtime, file_stat.st_size, sha256))
+    
+    conn.commit()
+    return changed
+
+def manifest_entries(parser, files, sources, manifest):
+    """
+    (source_url, month, is_revised, fingerprint) for each file taken this run that
+    was downloaded from sources. A file revises its month when that month was already
+    ingested from another URL, or from the same URL with different content.
+    Files that failed to parse or held no rows are recorded under the month in
+    their name, so the update checker stops offering them again
+    """
+    entries = []
+    for file_name, _, _, sha256 in files:
+        source_url = sources.get(file_name)
+        if not source_url:
+            continue
+        month = parser.file_months.get(file_name)
+        if month is None:
+            entries.append((source_url, manifest_month(parser.extract_month_from_filename(file_name)), False, sha256))
+            continue
+        month = month.strftime("%Y-%m-%d")
+        is_revised = any(
+            known_month == month and (url != source_url or fingerprint != sha256)
+            for url, (known_month, fingerprint) in manifest.items()
+        )
+        entries.append((source_url, month, is_revised, sha256))
+    return entries
+
+def process_and_store_excel_files(full_reload=False, sources=None):
+    """
+    Process new or changed Excel files and store their data in the database.
+    sources maps downloaded file names to their URLs for the ingest manifest.
+    Returns {'success', 'files_added', 'failed_files'}: success is False only
+    when the run itself failed; files that fail to parse are listed in
+    failed_files and recorded so they are not retried until they change
+    """
+    sources = sources or {}
+    try:
+        # Initialize parser
+        parser = RBIExcelParser(excel_dir=EXCEL_DIR, workers=PARSER_WORKERS, cache_dir=PARSE_CACHE_DIR)
         
         # Connect to database
         conn = sqlite3.connect(DB_PATH)
         cursor = conn.cursor()
         
+        # Work out which files need ingesting
+        if full_reload:
+            cursor.execute("DELETE FROM ingested_files")
+            conn.commit()
+        excel_files = parser.get_excel_files()
+        changed_files = get_changed_excel_files(conn, excel_files)
+        
+        # Downloads missing from the manifest were never ingested successfully; take them again
+        manifest = load_manifest(cursor)
+        changed_names = {f[0] for f in changed_files}
+        for file_name, source_url in sources.items():
+            if source_url not in manifest and file_name in excel_files and file_name not in changed_names:
+                file_path = os.path.join(EXCEL_DIR, file_name)
+                file_stat = os.stat(file_path)
+                changed_files.append((file_name, file_stat.st_mtime, file_stat.st_size, file_sha256(file_path)))
+        
+        if not changed_files:
+            logger.info("No new or changed Excel files to ingest")
+            conn.close()
+            return {'success': True, 'files_added': 0, 'failed_files': {}}
+        
+        logger.info(f"Ingesting {len(changed_files)} new or changed Excel files")
+        
+        # Process only the delta
+        batches = parser.process_all_batches(file_names=[f[0] for f in changed_files])
+        
+        if not batches:
+            logger.warning("No data processed from Excel files")
+        
         # Begin transaction
         conn.execute("BEGIN TRANSACTION")
         
-        # Process each record
-        records_added = 0
-        for record in all_data:
-            # Insert or update bank
-            cursor.execute(
-                "INSERT OR IGNORE INTO banks (bank_name, bank_type) VALUES (?, ?)",
-                (record['bank_name'], record['bank_type'])
-            )
-            
-            # Get bank ID
-            cursor.execute("SELECT id FROM banks WHERE bank_name = ?", (record['bank_name'],))
-            bank_id = cursor.fetchone()[0]
-            
-            # Format month as string for storage
-            month_str = record['month_str']
-            month = record['month'].strftime("%Y-%m-%d")
-            
-            # Insert or update monthly stats
-            cursor.execute("""
-            INSERT OR REPLACE INTO monthly_stats 
-            (bank_id, month, month_str, credit_cards, debit_cards, atm_onsite, atm_offsite, 
-            pos_terminals, micro_atms, bharat_qr_codes, upi_qr_codes, pos_txn_volume, 
-            pos_txn_value, online_txn_volume, online_txn_value)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                bank_id, month, month_str, record['credit_cards'], record['debit_cards'],
-                record['atm_onsite'], record['atm_offsite'], record['pos_terminals'],
-                record['micro_atms'], record['bharat_qr_codes'], record['upi_qr_codes'],
-                record['pos_txn_volume'], record['pos_txn_value'], record['online_txn_volume'],
-                record['online_txn_value']
-            ))
-            
-            records_added += 1
+        # Bulk-write banks and monthly stats
+        records_added = upsert_stats_batches(conn, batches)
+        
+        # Record every file taken this run; failed files keep their error and
+        # are retried only once their contents change (or on a full reload)
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        ingested = [f for f in changed_files if f[0] not in parser.file_errors]
+        cursor.executemany(
+            "INSERT OR REPLACE INTO ingested_files (file_name, mtime, size, sha256, records, ingested_at, error) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(file_name, mtime, size, sha256, parser.file_records.get(file_name, 0), now, parser.file_errors.get(file_name))
+             for file_name, mtime, size, sha256 in changed_files]
+        )
+        record_manifest(conn, manifest_entries(parser, changed_files, sources, manifest))
         
         # Record update
         cursor.execute(
             "INSERT INTO updates (check_time, update_time, new_data_available, files_added) VALUES (?, ?, ?, ?)",
-            (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), datetime.now().strftime("%Y-%m-%d %H:%M:%S"), 1, len(parser.get_excel_files()))
+            (now, now, 1, len(ingested))
         )
         
         # Commit transaction
         conn.commit()
         conn.close()
         
-        logger.info(f"Successfully processed and stored {records_added} records")
-        return True
+        for file_name, error in parser.file_errors.items():
+            logger.warning(f"Skipped {file_name} until it changes: {error}")
+        logger.info(f"Successfully processed and stored {records_added} records from {len(ingested)} files")
+        return {'success': True, 'files_added': len(ingested), 'failed_files': dict(parser.file_errors)}
     except Exception as e:
         logger.error(f"Error processing and storing Excel files: {str(e)}")
-        return False
+        return {'success': False, 'files_added': 0, 'failed_files': {}}
 
-# Global data storage
-data = {
-    'all_data': None,
-    'credit_card_data': None,
-    'debit_card_data': None,
-    'banks': None,
-    'last_updated': None
-}
+# Current dataset snapshot; load_data() builds a new one and swaps it in
+dataset = DatasetStore()
+response_cache.track(dataset)
+shared_snapshot = SharedSnapshot(SHARED_SNAPSHOT_DIR) if SHARED_SNAPSHOT_DIR else None
 
-def load_data():
-    """Load data from database or process Excel files if needed"""
-    global data
+def install_data(new_data, version=None):
+    """Publish the new snapshot and drop the responses cached for the previous version"""
+    dataset.publish(new_data, version)
+    response_cache.invalidate()
+    log_memory_report(new_data)
+
+def load_shared_data(refresh=False):
+    """
+    Map the snapshot shared by all workers. Only one process at a time reads
+    the database and publishes a new version: the first to start, or the one
+    handling a refresh
+    """
+    with shared_snapshot.writer_lock():
+        shared = None if refresh else shared_snapshot.load()
+        if shared is None:
+            db_data = load_data_from_db()
+            if not db_data:
+                logger.error("Failed to load data from database")
+                return False
+            frames = data_frames(db_data)
+            shared_snapshot.publish(
+                {name: frames[name] for name in SHARED_FRAMES},
+                {'last_updated': db_data['last_updated']}
+            )
+            shared = shared_snapshot.load()
     
+    version, frames, meta = shared
+    # Frames were compacted, if enabled, before they were published
+    install_data(build_dataset(frames, meta.get('last_updated'), compact=False), version)
+    logger.info(f"Mapped shared snapshot version {version}")
+    return True
+
+def pick_up_shared_data():
+    """Switch to a snapshot another worker published since this one loaded"""
+    current = dataset.current
+    if current is not None and shared_snapshot.latest_version() != current.version:
+        load_shared_data()
+
+def load_data(refresh=False):
+    """Load data from database or process Excel files if needed"""
     # Check if database exists
-    if not os.path.exists(DB_PATH):
-        logger.info("Database does not exist, initializing...")
-        init_db()
+    db_exists = os.path.exists(DB_PATH)
+    
+    # Create any missing tables (also upgrades older databases)
+    init_db()
+    
+    if not db_exists:
+        logger.info("Database did not exist, initialized")
         
         # Process Excel files
         logger.info("Processing Excel files for initial data load...")
         process_and_store_excel_files()
     
+    if shared_snapshot:
+        return load_shared_data(refresh)
+    
     # Load data from database
     db_data = load_data_from_db()
     
     if db_data:
-        data = db_data
+        install_data(db_data)
         logger.info("Data loaded successfully from database")
         return True
     else:
         logger.error("Failed to load data from database")
         return False
 
+def data_frames(data):
+    """Loaded DataFrames by name"""
+    frames = {name: data[name] for name in ('all_data', 'credit_card_data', 'debit_card_data', 'banks', 'rollup')}
+    frames['growth'] = data['growth']['all_data']
+    return frames
+
+def log_memory_report(data):
+    """Log the memory held by each loaded DataFrame"""
+    report = memory_report(data_frames(data))
+    sizes = {
+        name: f"{frame['total_bytes'] / 1024 / 1024:.2f} MB" if 'total_bytes' in frame else f"shared with {frame['shared_with']}"
+        for name, frame in report.items()
+    }
+    logger.info(f"Memory usage (compact mode {'on' if COMPACT_MODE else 'off'}): {sizes}")
+
+def current_data():
+    """Current dataset snapshot, loading it once if nothing is loaded yet"""
+    snapshot = dataset.get_or_load(load_data)
+    if shared_snapshot and snapshot is not None and shared_snapshot.newer_version_due(snapshot.version):
+        dataset.reload(pick_up_shared_data)
+        snapshot = dataset.current
+    if snapshot is not None:
+        # Report the version this request actually read
+        g.dataset_version = snapshot.version
+    return snapshot
+
 def get_bank_types():
     """Get unique bank types"""
-    if data['all_data'] is not None and 'bank_type' in data['all_data'].columns:
-        return sorted(data['all_data']['bank_type'].unique().tolist())
+    data = dataset.current
+    if data is not None:
+        return data['indexes']['all_data']['sorted'].get('bank_type', [])
     return []
 
 def get_banks_by_type(bank_type=None):
     """Get banks filtered by type"""
-    if data['all_data'] is not None:
+    data = dataset.current
+    if data is not None:
+        indexes = data['indexes']['all_data']
         if bank_type and bank_type != 'All':
-            filtered = data['all_data'][data['all_data']['bank_type'] == bank_type]
-            return sorted(filtered['bank_name'].unique().tolist())
+            return indexes['banks_by_type'].get(bank_type, [])
         else:
-            return sorted(data['all_data']['bank_name'].unique().tolist())
+            return indexes['sorted'].get('bank_name', [])
     return []
 
 def get_months():
     """Get available months"""
-    if data['all_data'] is not None and 'month_str' in data['all_data'].columns:
-        return sorted(data['all_data']['month_str'].unique().tolist())
+    data = dataset.current
+    if data is not None:
+        return data['indexes']['all_data']['sorted'].get('month_str', [])
     return []
 
-def calculate_mom_growth(df, value_col):
-    """Calculate month-on-month growth for a specific metric"""
+def calculate_mom_growth(df, value_col, growth):
+    """Month-on-month growth for a specific metric, read from the load-time growth columns"""
     if df is None or len(df) == 0:
         return pd.DataFrame()
     
-    # Sort by month
+    # Sort by month; rows keep the labels they share with growth
     df = df.sort_values('month')
+    rows = growth.loc[df.index]
+    return df.assign(
+        previous=rows[value_col + '_previous'].to_numpy(),
+        growth=rows[value_col + '_growth'].to_numpy()
+    )
+
+# Source frame, columns and metric of each card type
+CARD_TYPES = {
+    'credit': ('credit_card_data', CREDIT_CARD_COLUMNS, 'credit_cards'),
+    'debit': ('debit_card_data', DEBIT_CARD_COLUMNS, 'debit_cards')
+}
+
+def card_data_frame(data, card_type, bank_type='All', bank_name='All', include_growth=False, view=None):
+    """Credit or debit card rows for the filters (or an already filtered view), optionally with growth"""
+    name, columns, value_col = CARD_TYPES[card_type]
+    if view is None:
+        # Apply filters through the load-time indexes
+        view = filter_rows(data[name], data['indexes'][name], bank_type=bank_type, bank_name=bank_name)
+    df = select_columns(view, columns)
     
-    # Group by bank and calculate growth
-    result = df.copy()
-    result['previous'] = result.groupby('bank_name')[value_col].shift(1)
-    result['growth'] = ((result[value_col] - result['previous']) / result['previous'] * 100).round(2)
+    # Calculate growth if requested
+    if include_growth:
+        df = calculate_mom_growth(df, value_col, data['growth'][name])
+    return df
+
+def top_banks_frame(data, card_type, limit):
+    """Banks with the most credit or debit cards in the latest month"""
+    # Get the latest month data
+    latest_month = data['all_data']['month'].max()
+    latest_data = data['all_data'][data['all_data']['month'] == latest_month]
     
-    return result
+    # Sort by card count
+    if card_type.lower() == 'credit':
+        sorted_data = latest_data.sort_values('credit_cards', ascending=False, kind='stable')
+        return sorted_data[['bank_name', 'bank_type', 'credit_cards']].head(limit)
+    else:
+        sorted_data = latest_data.sort_values('debit_cards', ascending=False, kind='stable')
+        return sorted_data[['bank_name', 'bank_type', 'debit_cards']].head(limit)
+
+def trend_frame(data, card_type, bank_type='All'):
+    """Monthly credit or debit card totals for a bank type"""
+    # Read monthly totals from the rollup
+    if card_type.lower() == 'credit':
+        monthly_sum = rollup_totals(data['rollup'], ['credit_cards'], bank_type)
+        monthly_sum = monthly_sum.rename(columns={'credit_cards': 'value'})
+    else:
+        monthly_sum = rollup_totals(data['rollup'], ['debit_cards'], bank_type)
+        monthly_sum = monthly_sum.rename(columns={'debit_cards': 'value'})
+    
+    # Add card type for reference
+    monthly_sum['card_type'] = card_type
+    return monthly_sum
+
+def comparison_frame(data, bank_name='All'):
+    """Monthly credit and debit cards for one bank, or totals over all banks"""
+    if bank_name and bank_name != 'All':
+        # For single bank, show the actual values
+        df = filter_rows(data['all_data'], data['indexes']['all_data'], bank_name=bank_name)
+        return df[['month_str', 'credit_cards', 'debit_cards']]
+    else:
+        # For all banks, read monthly totals from the rollup
+        return rollup_totals(data['rollup'], ['credit_cards', 'debit_cards'])
+
+@app.after_request
+def add_dataset_version(response):
+    """Tell clients which dataset snapshot is current"""
+    version = g.get('dataset_version')
+    if version is None and dataset.current is not None:
+        version = dataset.current.version
+    if version is not None:
+        response.headers['X-Dataset-Version'] = str(version)
+    return response
 
 @app.route('/')
 def index():
     """Main dashboard page"""
     # Load data if not already loaded
-    if data['all_data'] is None:
-        load_data()
+    data = current_data()
     
     # Get filter options
     bank_types = get_bank_types()
@@ -287,7 +573,7 @@ def index():
     return render_template('index.html', 
                           bank_types=bank_types,
                           months=months,
-                          last_updated=data['last_updated'])
+                          last_updated=data['last_updated'] if data else None)
 
 @app.route('/api/banks')
 def get_banks():
@@ -297,134 +583,125 @@ def get_banks():
     return jsonify(banks)
 
 @app.route('/api/credit_card_data')
+@response_cache.cached(bank_type='All', bank_name='All', include_growth='false')
 def get_credit_card_data():
     """API endpoint to get credit card data with filters"""
     bank_type = request.args.get('bank_type', 'All')
     bank_name = request.args.get('bank_name', 'All')
+    include_growth = request.args.get('include_growth', 'false').lower() == 'true'
     
-    if data['credit_card_data'] is None:
-        load_data()
-    
-    df = data['credit_card_data']
-    
-    # Apply filters
-    if bank_type and bank_type != 'All':
-        df = df[df['bank_type'] == bank_type]
-    
-    if bank_name and bank_name != 'All':
-        df = df[df['bank_name'] == bank_name]
-    
-    # Calculate growth if requested
-    if request.args.get('include_growth', 'false').lower() == 'true':
-        df = calculate_mom_growth(df, 'credit_cards')
+    data = current_data()
+    df = card_data_frame(data, 'credit', bank_type, bank_name, include_growth)
     
     # Convert to dict for JSON response
     result = df.to_dict(orient='records')
     return jsonify(result)
 
 @app.route('/api/debit_card_data')
+@response_cache.cached(bank_type='All', bank_name='All', include_growth='false')
 def get_debit_card_data():
     """API endpoint to get debit card data with filters"""
     bank_type = request.args.get('bank_type', 'All')
     bank_name = request.args.get('bank_name', 'All')
+    include_growth = request.args.get('include_growth', 'false').lower() == 'true'
     
-    if data['debit_card_data'] is None:
-        load_data()
-    
-    df = data['debit_card_data']
-    
-    # Apply filters
-    if bank_type and bank_type != 'All':
-        df = df[df['bank_type'] == bank_type]
-    
-    if bank_name and bank_name != 'All':
-        df = df[df['bank_name'] == bank_name]
-    
-    # Calculate growth if requested
-    if request.args.get('include_growth', 'false').lower() == 'true':
-        df = calculate_mom_growth(df, 'debit_cards')
+    data = current_data()
+    df = card_data_frame(data, 'debit', bank_type, bank_name, include_growth)
     
     # Convert to dict for JSON response
     result = df.to_dict(orient='records')
     return jsonify(result)
 
 @app.route('/api/top_banks')
+@response_cache.cached(card_type='credit', limit='10')
 def get_top_banks():
     """API endpoint to get top banks by credit or debit cards"""
     card_type = request.args.get('card_type', 'credit')
     limit = int(request.args.get('limit', 10))
     
-    if data['all_data'] is None:
-        load_data()
-    
-    # Get the latest month data
-    latest_month = data['all_data']['month'].max()
-    latest_data = data['all_data'][data['all_data']['month'] == latest_month]
-    
-    # Sort by card count
-    if card_type.lower() == 'credit':
-        sorted_data = latest_data.sort_values('credit_cards', ascending=False)
-        result = sorted_data[['bank_name', 'bank_type', 'credit_cards']].head(limit)
-    else:
-        sorted_data = latest_data.sort_values('debit_cards', ascending=False)
-        result = sorted_data[['bank_name', 'bank_type', 'debit_cards']].head(limit)
+    data = current_data()
+    result = top_banks_frame(data, card_type, limit)
     
     return jsonify(result.to_dict(orient='records'))
 
 @app.route('/api/trend_data')
+@response_cache.cached(card_type='credit', bank_type='All')
 def get_trend_data():
     """API endpoint to get trend data for charts"""
     card_type = request.args.get('card_type', 'credit')
     bank_type = request.args.get('bank_type', 'All')
     
-    if data['all_data'] is None:
-        load_data()
-    
-    df = data['all_data']
-    
-    # Apply bank type filter
-    if bank_type and bank_type != 'All':
-        df = df[df['bank_type'] == bank_type]
-    
-    # Group by month and sum
-    if card_type.lower() == 'credit':
-        monthly_sum = df.groupby('month_str')['credit_cards'].sum().reset_index()
-        monthly_sum = monthly_sum.rename(columns={'credit_cards': 'value'})
-    else:
-        monthly_sum = df.groupby('month_str')['debit_cards'].sum().reset_index()
-        monthly_sum = monthly_sum.rename(columns={'debit_cards': 'value'})
-    
-    # Add card type for reference
-    monthly_sum['card_type'] = card_type
+    data = current_data()
+    monthly_sum = trend_frame(data, card_type, bank_type)
     
     return jsonify(monthly_sum.to_dict(orient='records'))
 
 @app.route('/api/comparison_data')
+@response_cache.cached(bank_name='All')
 def get_comparison_data():
     """API endpoint to get comparison data between credit and debit cards"""
     bank_name = request.args.get('bank_name', 'All')
     
-    if data['all_data'] is None:
-        load_data()
+    data = current_data()
+    monthly_data = comparison_frame(data, bank_name)
     
-    df = data['all_data']
-    
-    # Apply bank filter
-    if bank_name and bank_name != 'All':
-        df = df[df['bank_name'] == bank_name]
+    return jsonify(monthly_data.to_dict(orient='records'))
+
+@app.route('/api/dashboard')
+@response_cache.cached(bank_type='All', bank_name='All', limit='10')
+def get_dashboard():
+    """
+    API endpoint to get every dashboard panel for one filter set in a single
+    response, with the server-side compute time of each panel
+    """
+    bank_type = request.args.get('bank_type', 'All')
+    bank_name = request.args.get('bank_name', 'All')
+    limit = int(request.args.get('limit', 10))
     
-    # Group by month
-    if bank_name and bank_name != 'All':
-        # For single bank, show the actual values
-        monthly_data = df[['month_str', 'credit_cards', 'debit_cards']]
-    else:
-        # For all banks, sum by month
-        monthly_data = df.groupby('month_str').agg({
-            'credit_cards': 'sum',
-            'debit_cards': 'sum'
-        }).reset_index()
+    data = current_data()
+    timer = PanelTimer()
+    
+    # Filter once; the card frames share all_data's rows, so every card panel reads this view
+    with timer('filter'):
+        view = filter_rows(data['all_data'], data['indexes']['all_data'], bank_type=bank_type, bank_name=bank_name)
+    views = {'credit': view, 'debit': view}
+    
+    panels = {}
+    for card_type in ('credit', 'debit'):
+        value_col = card_type + '_cards'
+        with timer(card_type + '_total'):
+            df = card_data_frame(data, card_type, view=views[card_type])
+            panels['total_' + value_col] = int(df[value_col].sum())
+        with timer(card_type + '_trend'):
+            panels[card_type + '_trend'] = trend_frame(data, card_type, bank_type).to_dict(orient='records')
+        with timer(card_type + '_top_banks'):
+            panels[card_type + '_top_banks'] = top_banks_frame(data, card_type, limit).to_dict(orient='records')
+        with timer(card_type + '_growth'):
+            df = card_data_frame(data, card_type, include_growth=True, view=views[card_type])
+            panels[card_type + '_growth'] = average_growth_by_month(df).to_dict(orient='records')
+    with timer('comparison'):
+        panels['comparison'] = comparison_frame(data, bank_name).to_dict(orient='records')
     
-    return jsonify(monthly_data.to_dict(orient='records'))
+    return jsonify({
+        'filters': {'bank_type': bank_type, 'bank_name': bank_name},
+        'panels': panels,
+        'timings_ms': timer.timings,
+        'dataset_version': data.version
+    })
+
+@app.route('/api/cache_stats')
+def get_cache_stats():
+    """API endpoint to get response cache statistics"""
+    return jsonify(response_cache.stats())
+
+@app.route('/api/admin/memory')
+def get_memory_report():
+    """API endpoint to get memory usage of the loaded data"""
+    data = current_data()
+    return jsonify({
+        'compact_mode': COMPACT_MODE,
+        'frames': memory_report(data_frames(data))
+    })
 
 @app.route('/api/check_updates')
 def api_check_updates():
@@ -456,24 +733,42 @@ def refresh_data():
         # Download new files
         download_result = download_updates()
         
-        # Process and store new data
-        success = process_and_store_excel_files()
+        # Process and store new data, with no load running alongside; the
+        # downloads enter the ingest manifest only once they are stored
+        ingest_result = dataset.reload(lambda: process_and_store_excel_files(sources=download_result['sources']))
+        success = ingest_result['success']
+        failed_files = ingest_result['failed_files']
         
-        # Reload data
+        # Reload data; readers keep the old snapshot until the new one is published
         if success:
-            load_data()
+            success = dataset.reload(lambda: load_data(refresh=True))
     else:
         # Just reload existing data
-        success = load_data()
+        success = dataset.reload(lambda: load_data(refresh=True))
+        failed_files = {}
     
+    data = dataset.current
     return jsonify({
         'success': success,
         'last_updated': data['last_updated'] if success else None,
-        'new_data_available': update_info['new_data_available']
+        'new_data_available': update_info['new_data_available'],
+        'failed_files': failed_files,
+        'dataset_version': data.version if data else None
     })
 
 @app.route('/api/export_csv')
 def export_csv():
     """API endpoint to export data as CSV"""
- 
-(Content truncated due to size limit. Use line ranges to read in chunks)
\ No newline at end of file
+    data = current_data()
+    
+    # Write all loaded statistics to a CSV file and send it
+    export_path = os.path.join(DATA_DIR, "rbi_card_stats.csv")
+    data['all_data'].to_csv(export_path, index=False)
+    return send_file(export_path, mimetype='text/csv', as_attachment=True)
+
+if __name__ == '__main__':
+    # Load data on startup
+    load_data()
+    
+    # Run the app
+    app.run(host='0.0.0.0', port=5000, debug=True)
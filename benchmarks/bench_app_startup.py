@@ -0,0 +1,79 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+import random
+import tempfile
+import time
+import pandas as pd
+
+def write_sample_csvs(data_dir, months, banks):
+    """CSV files shaped like Processed_Data"""
+    rows = []
+    for m in range(months):
+        month = pd.Timestamp(2000 + m // 12, m % 12 + 1, 1)
+        for i in range(banks):
+            rows.append({
+                'month': month.strftime("%Y-%m-%d"),
+                'month_str': month.strftime("%B-%Y"),
+                'bank_name': f"Bank {i}",
+                'bank_type': f"Type {i % 5}",
+                'credit_cards': random.randint(0, 10_000_000),
+                'debit_cards': random.randint(0, 10_000_000)
+            })
+    df = pd.DataFrame(rows)
+    os.makedirs(data_dir, exist_ok=True)
+    df.to_csv(os.path.join(data_dir, "all_rbi_data.csv"), index=False)
+    df.drop(columns=['debit_cards']).to_csv(os.path.join(data_dir, "credit_card_data.csv"), index=False)
+    df.drop(columns=['credit_cards']).to_csv(os.path.join(data_dir, "debit_card_data.csv"), index=False)
+    pd.DataFrame({'bank_type': sorted(df['bank_type'].unique())}).to_csv(
+        os.path.join(data_dir, "bank_types.csv"), index=False)
+
+def time_load(app, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        app.load_data()
+        best = min(best, time.perf_counter() - start)
+    return best, app.dataset.current['load_stats']
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare app.py startup from CSV and from the Feather cache")
+    parser.add_argument("--months", type=int, default=120)
+    parser.add_argument("--banks", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # app.py resolves its data paths from the working directory at import
+        os.chdir(tmp)
+        write_sample_csvs(os.path.join(tmp, "Processed_Data"), args.months, args.banks)
+        import app
+
+        for name, path in app.CSV_PATHS.items():
+            print(f"{name:<17} {os.path.getsize(path) / 1e6:8.1f} MB csv")
+
+        # No cache: every load parses the CSVs
+        app.FRAME_CACHE_DIR = os.path.join(tmp, "no_cache")
+        csv_seconds = float('inf')
+        for _ in range(args.repeat):
+            if os.path.exists(app.FRAME_CACHE_DIR):
+                for name in os.listdir(app.FRAME_CACHE_DIR):
+                    os.remove(os.path.join(app.FRAME_CACHE_DIR, name))
+            seconds, csv_stats = time_load(app, 1)
+            csv_seconds = min(csv_seconds, seconds)
+
+        # Warm cache: loads come from Feather
+        app.FRAME_CACHE_DIR = os.path.join(tmp, "frame_cache")
+        app.load_data()
+        feather_seconds, feather_stats = time_load(app, args.repeat)
+        os.chdir(os.path.dirname(tmp))
+
+    # Total load_data time, and the part spent reading the frames
+    for stats, seconds in ((csv_stats, csv_seconds), (feather_stats, feather_seconds)):
+        print(f"{stats['source']:<8} {seconds:8.3f}s total  {stats['seconds']:8.3f}s reading")
+    print(f"speedup  {csv_seconds / feather_seconds:8.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+import random
+import tempfile
+import time
+import pandas as pd
+from openpyxl import Workbook
+from excel_parser import RBIExcelParser
+
+MONTHS = ["JANUARY", "FEBRUARY", "MARCH", "APRIL", "MAY", "JUNE",
+          "JULY", "AUGUST", "SEPTEMBER", "OCTOBER", "NOVEMBER", "DECEMBER"]
+
+def legacy_parse_excel(file_path):
+    """Previous implementation: three pd.read_excel passes over the same workbook"""
+    preview = pd.read_excel(file_path, header=None, nrows=10)
+    header_row_idx = None
+    for i in range(len(preview)):
+        if preview.iloc[i].astype(str).str.contains("Bank Name", case=False).any():
+            header_row_idx = i
+            break
+    if header_row_idx is None:
+        raise ValueError("Could not find header row with 'Bank Name'")
+
+    header_rows = pd.read_excel(file_path, header=None, skiprows=header_row_idx, nrows=3)
+    multi_header = header_rows.ffill(axis=1).astype(str)
+    combined_header = multi_header.apply(lambda x: ' '.join(map(str, x)).strip().lower(), axis=0)
+
+    df = pd.read_excel(file_path, header=None, skiprows=header_row_idx + 3)
+    if len(combined_header) > len(df.columns):
+        combined_header = combined_header[:len(df.columns)]
+    elif len(combined_header) < len(df.columns):
+        combined_header = combined_header.tolist() + [f"extra_col_{i}" for i in range(len(df.columns) - len(combined_header))]
+    df.columns = combined_header
+
+    bank_col = [col for col in df.columns if "bank name" in col][0]
+    credit_col = [col for col in df.columns if "credit card" in col][0]
+    debit_col = [col for col in df.columns if "debit card" in col][0]
+
+    df_filtered = df[[bank_col, credit_col, debit_col]].dropna(subset=[bank_col])
+    df_filtered.columns = ["Bank Name", "Credit Cards Outstanding", "Debit Cards Outstanding"]
+    return df_filtered.reset_index(drop=True)
+
+def write_sample_workbook(file_path, banks):
+    """Write a workbook shaped like the RBI bank-wise ATM/POS/Card statistics sheet"""
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["Bank-wise ATM/POS/Card Statistics"])
+    ws.append([])
+    ws.append(["Sr. No.", "Bank Name", "Infrastructure", None, None, None, None, None, None, None,
+               "Card Payments Transactions", None, None, None])
+    ws.append([None, None, "ATMs & CRMs", None, "PoS", "Micro ATMs", "Bharat QR Codes", "UPI QR Codes",
+               "Credit Cards", "Debit Cards", "At PoS", None, "Online (e-com)", None])
+    ws.append([None, None, "On-site", "Off-site", None, None, None, None, None, None,
+               "Volume", "Value", "Volume", "Value"])
+    for i in range(banks):
+        ws.append([i + 1, f"Bank {i}"] + [random.randint(0, 10_000_000) for _ in range(10)]
+                  + [round(random.uniform(0, 1e7), 2), random.randint(0, 10_000_000)])
+    wb.save(file_path)
+
+def run(label, parse, files):
+    start = time.perf_counter()
+    rows = 0
+    for file_path in files:
+        rows += len(parse(file_path))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12} {len(files) / elapsed:8.2f} files/sec  ({rows} rows, {elapsed:.2f}s)")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the legacy and single-pass Excel readers")
+    parser.add_argument("--files", type=int, default=12)
+    parser.add_argument("--banks", type=int, default=300)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = []
+        for i in range(args.files):
+            file_path = os.path.join(tmp, f"ATM{MONTHS[i % 12]}{2015 + i // 12}.xlsx")
+            write_sample_workbook(file_path, args.banks)
+            files.append(file_path)
+
+        parser = RBIExcelParser(excel_dir=tmp)
+        before = run("legacy", legacy_parse_excel, files)
+        after = run("single-pass", parser.parse_excel, files)
+        print(f"speedup      {before / after:8.2f}x")
+
+if __name__ == "__main__":
+    main()
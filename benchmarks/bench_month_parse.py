@@ -0,0 +1,97 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+import glob
+import logging
+import random
+import time
+import tracemalloc
+from bs4 import BeautifulSoup
+from src.utils.scraper import parse_month_html, parse_int, parse_float
+
+def legacy_extract(html):
+    """Previous extraction: full html.parser tree, scan every table, get_text() per field"""
+    soup = BeautifulSoup(html, 'html.parser')
+    main_table = None
+    for table in soup.find_all('table'):
+        if table.find('tr') and len(table.find_all('tr')) > 5:
+            main_table = table
+            break
+    if not main_table:
+        return []
+
+    fields = ['atm_onsite', 'atm_offsite', 'pos_terminals', 'micro_atms', 'bharat_qr_codes',
+              'upi_qr_codes', 'credit_cards', 'debit_cards', 'pos_txn_volume', 'pos_txn_value',
+              'online_txn_volume', 'online_txn_value']
+    bank_data = []
+    bank_type = None
+    for row in main_table.find_all('tr')[3:]:
+        cells = row.find_all('td')
+        if len(cells) < 5:
+            continue
+        if len(cells) == 1 or (len(cells) > 1 and not cells[0].get_text().strip().isdigit()):
+            bank_type_text = cells[0].get_text().strip()
+            if bank_type_text and not bank_type_text.isdigit():
+                bank_type = bank_type_text
+            continue
+        bank_name = cells[1].get_text().strip() if len(cells) > 1 else ""
+        if not bank_name:
+            continue
+        data = {'bank_type': bank_type, 'bank_name': bank_name}
+        for i, field in enumerate(fields, start=2):
+            data[field] = 0
+            if len(cells) > i:
+                parse = parse_float if field.endswith('_value') else parse_int
+                data[field] = parse(cells[i].get_text().strip())
+        bank_data.append(data)
+    return bank_data
+
+def sample_page(banks):
+    """A page shaped like an RBI bank-wise ATM/POS/Card statistics month"""
+    header = '<tr>' + '<td>Header</td>' * 14 + '</tr>'
+    rows = []
+    for group in range(0, banks, 50):
+        rows.append('<tr><td colspan="14"><b>Bank Group</b></td><td></td><td></td><td></td><td></td></tr>')
+        for i in range(group, min(group + 50, banks)):
+            values = ''.join(f'<td align="right">{random.randint(0, 10_000_000):,}</td>' for _ in range(12))
+            rows.append(f'<tr><td>{i + 1}</td><td>Bank {i}</td>{values}</tr>')
+    nav = '<table><tr><td><a href="#">Home</a></td></tr></table>' * 20
+    return (f'<html><head><title>Bank-wise ATM/POS/Card Statistics for March 2025</title></head>'
+            f'<body>{nav}<table>{header * 3}{"".join(rows)}</table></body></html>')
+
+def measure(label, extract, pages):
+    """Time per page and tracemalloc peak (Python heap only; libxml2's C buffers are not counted)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    records = 0
+    for html in pages:
+        records += len(extract(html))
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<8} {elapsed / len(pages) * 1000:8.1f} ms/month  peak {peak / 1024 / 1024:6.1f} MiB  ({records} records)")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare BeautifulSoup and lxml month-page extraction")
+    parser.add_argument("pages_dir", nargs="?", help="Directory of saved RBI month pages (*.html)")
+    parser.add_argument("--banks", type=int, default=300, help="Banks per synthetic page when no pages_dir is given")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    if args.pages_dir:
+        pages = []
+        for path in sorted(glob.glob(os.path.join(args.pages_dir, "*.htm*"))):
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                pages.append(f.read())
+    else:
+        pages = [sample_page(args.banks) for _ in range(12)]
+
+    before = measure("legacy", legacy_extract, pages)
+    after = measure("lxml", lambda html: parse_month_html(html, "", "")[1], pages)
+    print(f"speedup  {before / after:8.2f}x")
+
+if __name__ == "__main__":
+    main()
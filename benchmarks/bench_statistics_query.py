@@ -0,0 +1,116 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+import logging
+import random
+import tempfile
+import time
+import warnings
+from datetime import date
+from flask import Flask, jsonify, request
+from sqlalchemy import event
+from sqlalchemy.exc import LegacyAPIWarning
+from src.models.db import db
+from src.models.bank import Bank
+from src.models.monthly_statistic import MonthlyStatistic
+from src.routes.api import api_bp
+from src.utils.scraper import STAT_FIELDS, FLOAT_FIELDS
+
+BANK_TYPES = ["Public Sector Banks", "Private Sector Banks", "Foreign Banks", "Payment Banks"]
+
+def legacy_statistics():
+    """Previous /api/statistics metric path: to_dict() and Bank.query.get() per row"""
+    bank_type = request.args.get('bank_type')
+    metric = request.args.get('metric')
+    query = db.session.query(MonthlyStatistic).join(Bank)
+    if bank_type:
+        query = query.filter(Bank.bank_type == bank_type)
+    result = []
+    for stat in query.all():
+        stat_dict = stat.to_dict()
+        if metric in stat_dict:
+            result.append({
+                'bank_id': stat_dict['bank_id'],
+                'bank_name': Bank.query.get(stat_dict['bank_id']).bank_name,
+                'month': stat_dict['month'],
+                metric: stat_dict[metric]
+            })
+    return jsonify({'success': True, 'count': len(result), 'data': result})
+
+def create_app(db_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    app.register_blueprint(api_bp, url_prefix='/api')
+    app.add_url_rule('/legacy/statistics', 'legacy_statistics', legacy_statistics)
+    return app
+
+def populate(months, banks):
+    """banks synthetic banks, spread over BANK_TYPES, with one statistics row per month"""
+    db.session.bulk_insert_mappings(Bank, [
+        {'bank_name': f"Bank {i}", 'bank_type': BANK_TYPES[i % len(BANK_TYPES)]} for i in range(banks)
+    ])
+    bank_ids = [bank_id for (bank_id,) in db.session.query(Bank.bank_id)]
+    for m in range(months):
+        month = date(2000 + m // 12, m % 12 + 1, 1)
+        rows = []
+        for bank_id in bank_ids:
+            row = {'bank_id': bank_id, 'month': month, 'is_revised': False}
+            for field in STAT_FIELDS:
+                row[field] = round(random.uniform(0, 1e7), 2) if field in FLOAT_FIELDS else random.randint(0, 10_000_000)
+            rows.append(row)
+        db.session.bulk_insert_mappings(MonthlyStatistic, rows)
+    db.session.commit()
+
+def measure(label, client, engine, url, repeat):
+    """Mean time per request and SQL statements per request; each request gets a fresh session"""
+    statements = []
+    listener = lambda *args: statements.append(1)
+    event.listen(engine, "before_cursor_execute", listener)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        response = client.get(url)
+    elapsed = (time.perf_counter() - start) / repeat
+    event.remove(engine, "before_cursor_execute", listener)
+    queries = len(statements) // repeat
+    print(f"{label:<11} {elapsed * 1000:9.1f} ms/request  {queries:5d} queries  ({response.json['count']} rows)")
+    return elapsed, queries, response.json
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the per-row and projected /api/statistics?metric= paths")
+    parser.add_argument("--months", type=int, default=60)
+    parser.add_argument("--banks", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--metric", default="credit_cards")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    # The legacy path calls Query.get() on purpose
+    warnings.simplefilter("ignore", LegacyAPIWarning)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app(os.path.join(tmp, "stats.db"))
+        with app.app_context():
+            db.create_all()
+            populate(args.months, args.banks)
+            engine = db.engine
+        client = app.test_client()
+
+        failed = False
+        for scope, params in (("bank type", f"metric={args.metric}&bank_type={BANK_TYPES[0]}"), ("all", f"metric={args.metric}")):
+            print(f"-- {scope}")
+            before, _, legacy = measure("legacy", client, engine, f"/legacy/statistics?{params}", args.repeat)
+            after, queries, projected = measure("projection", client, engine, f"/api/statistics?{params}", args.repeat)
+            print(f"speedup     {before / after:9.2f}x")
+            if projected != legacy:
+                print("FAIL: projection returned different data")
+                failed = True
+            if queries > 1:
+                print(f"FAIL: projection ran {queries} queries per request")
+                failed = True
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
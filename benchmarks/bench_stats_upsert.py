@@ -0,0 +1,107 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+import random
+import sqlite3
+import tempfile
+import time
+import pandas as pd
+from stats_store import METRIC_COLUMNS, CREATE_ROLLUP_SQL, upsert_stats_batches
+
+SCHEMA = """
+CREATE TABLE banks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    bank_name TEXT NOT NULL,
+    bank_type TEXT NOT NULL,
+    UNIQUE(bank_name)
+);
+CREATE TABLE monthly_stats (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    bank_id INTEGER NOT NULL,
+    month TEXT NOT NULL,
+    month_str TEXT NOT NULL,
+    credit_cards INTEGER NOT NULL DEFAULT 0,
+    debit_cards INTEGER NOT NULL DEFAULT 0,
+    atm_onsite INTEGER NOT NULL DEFAULT 0,
+    atm_offsite INTEGER NOT NULL DEFAULT 0,
+    pos_terminals INTEGER NOT NULL DEFAULT 0,
+    micro_atms INTEGER NOT NULL DEFAULT 0,
+    bharat_qr_codes INTEGER NOT NULL DEFAULT 0,
+    upi_qr_codes INTEGER NOT NULL DEFAULT 0,
+    pos_txn_volume INTEGER NOT NULL DEFAULT 0,
+    pos_txn_value REAL NOT NULL DEFAULT 0,
+    online_txn_volume INTEGER NOT NULL DEFAULT 0,
+    online_txn_value REAL NOT NULL DEFAULT 0,
+    FOREIGN KEY (bank_id) REFERENCES banks(id),
+    UNIQUE(bank_id, month)
+);
+"""
+
+def make_batches(months, banks):
+    """One synthetic batch per month, shaped like RBIExcelParser.process_all_batches output"""
+    batches = []
+    for m in range(months):
+        month = pd.Timestamp(2000 + m // 12, m % 12 + 1, 1)
+        df = pd.DataFrame({
+            'bank_name': [f"Bank {i}" for i in range(banks)],
+            'bank_type': "Scheduled Commercial Bank",
+            'month': month,
+            'month_str': month.strftime("%B-%Y"),
+        })
+        for col in METRIC_COLUMNS:
+            if col.endswith('_value'):
+                df[col] = [random.uniform(0, 1e7) for _ in range(banks)]
+            else:
+                df[col] = [random.randint(0, 10_000_000) for _ in range(banks)]
+        batches.append(df)
+    return batches
+
+def legacy_write(conn, batches):
+    """Previous writer: three statements per bank-month"""
+    cursor = conn.cursor()
+    for df in batches:
+        for record in df.to_dict(orient="records"):
+            cursor.execute(
+                "INSERT OR IGNORE INTO banks (bank_name, bank_type) VALUES (?, ?)",
+                (record['bank_name'], record['bank_type'])
+            )
+            cursor.execute("SELECT id FROM banks WHERE bank_name = ?", (record['bank_name'],))
+            bank_id = cursor.fetchone()[0]
+            cursor.execute(f"""
+            INSERT OR REPLACE INTO monthly_stats
+            (bank_id, month, month_str, {', '.join(METRIC_COLUMNS)})
+            VALUES (?, ?, ?, {', '.join('?' for _ in METRIC_COLUMNS)})
+            """, [bank_id, record['month'].strftime("%Y-%m-%d"), record['month_str']]
+                + [record[col] for col in METRIC_COLUMNS])
+
+def run(label, write, batches, db_path, rows):
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    conn.execute(CREATE_ROLLUP_SQL)
+    start = time.perf_counter()
+    conn.execute("BEGIN TRANSACTION")
+    write(conn, batches)
+    conn.commit()
+    elapsed = time.perf_counter() - start
+    count = conn.execute("SELECT COUNT(*) FROM monthly_stats").fetchone()[0]
+    conn.close()
+    print(f"{label:<8} {rows / elapsed:10.0f} rows/sec  ({count} rows, {elapsed:.2f}s)")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the per-row and bulk SQLite stats writers")
+    parser.add_argument("--months", type=int, default=120)
+    parser.add_argument("--banks", type=int, default=1000)
+    args = parser.parse_args()
+
+    batches = make_batches(args.months, args.banks)
+    rows = args.months * args.banks
+    with tempfile.TemporaryDirectory() as tmp:
+        before = run("legacy", legacy_write, batches, os.path.join(tmp, "legacy.db"), rows)
+        after = run("bulk", upsert_stats_batches, batches, os.path.join(tmp, "bulk.db"), rows)
+    print(f"speedup  {before / after:10.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -83,25 +83,41 @@ function setupEventListeners() {
     document.getElementById('export-csv-btn').addEventListener('click', exportToCSV);
 }
 
-// Load all dashboard data
+// Load all dashboard panels for the current filters in one request
 function loadDashboardData() {
     // Show loading indicators
     showLoadingState();
     
-    // Load overview data
-    loadOverviewData();
-    
-    // Load credit card data
-    loadCreditCardData();
-    
-    // Load debit card data
-    loadDebitCardData();
-    
-    // Load comparison data
-    loadComparisonData();
-    
-    // Load growth analysis data
-    loadGrowthAnalysisData();
+    fetch(`/api/dashboard?bank_type=${encodeURIComponent(currentFilters.bankType)}&bank_name=${encodeURIComponent(currentFilters.bank)}`)
+        .then(response => response.json())
+        .then(data => {
+            const panels = data.panels;
+            
+            // Overview
+            renderOverview(panels.total_credit_cards, panels.total_debit_cards);
+            
+            // Credit card panels
+            createTrendChart('credit-card-trend-chart', panels.credit_trend, 'Credit Cards', '#0d6efd');
+            renderTopBanks('top-credit-card-banks', panels.credit_top_banks, 'credit_cards');
+            
+            // Debit card panels
+            createTrendChart('debit-card-trend-chart', panels.debit_trend, 'Debit Cards', '#198754');
+            renderTopBanks('top-debit-card-banks', panels.debit_top_banks, 'debit_cards');
+            
+            // Comparison
+            createComparisonChart(panels.comparison);
+            
+            // Growth analysis (average growth per month)
+            createGrowthChart('credit-card-growth-chart', panels.credit_growth, 'Credit Card Growth (%)', '#0d6efd');
+            createGrowthChart('debit-card-growth-chart', panels.debit_growth, 'Debit Card Growth (%)', '#198754');
+            
+            // Server-side compute time per panel
+            console.debug('Dashboard panel timings (ms):', data.timings_ms);
+        })
+        .catch(error => {
+            console.error('Error loading dashboard data:', error);
+            showNotification('Error loading dashboard data. Please try again.', 'error');
+        });
     
     // Load detailed data table
     loadDetailedData();
@@ -121,35 +137,13 @@ function updateDashboard() {
     loadDashboardData();
 }
 
-// Load overview data
-function loadOverviewData() {
-    // Load total cards data
-    fetch(`/api/credit_card_data?bank_type=${encodeURIComponent(currentFilters.bankType)}&bank_name=${encodeURIComponent(currentFilters.bank)}`)
-        .then(response => response.json())
-        .then(data => {
-            // Calculate total credit cards
-            const totalCreditCards = data.reduce((sum, item) => sum + item.credit_cards, 0);
-            document.getElementById('total-credit-cards').textContent = formatNumber(totalCreditCards);
-            
-            // Load debit card data for overview
-            return fetch(`/api/debit_card_data?bank_type=${encodeURIComponent(currentFilters.bankType)}&bank_name=${encodeURIComponent(currentFilters.bank)}`);
-        })
-        .then(response => response.json())
-        .then(data => {
-            // Calculate total debit cards
-            const totalDebitCards = data.reduce((sum, item) => sum + item.debit_cards, 0);
-            document.getElementById('total-debit-cards').textContent = formatNumber(totalDebitCards);
-            
-            // Create card distribution chart
-            createCardDistributionChart(
-                parseInt(document.getElementById('total-credit-cards').textContent.replace(/,/g, '')),
-                parseInt(document.getElementById('total-debit-cards').textContent.replace(/,/g, ''))
-            );
-        })
-        .catch(error => {
-            console.error('Error loading overview data:', error);
-            showNotification('Error loading overview data. Please try again.', 'error');
-        });
+// Show overview totals and the card distribution chart
+function renderOverview(totalCreditCards, totalDebitCards) {
+    document.getElementById('total-credit-cards').textContent = formatNumber(totalCreditCards);
+    document.getElementById('total-debit-cards').textContent = formatNumber(totalDebitCards);
+    
+    // Create card distribution chart
+    createCardDistributionChart(totalCreditCards, totalDebitCards);
 }
 
 // Create card distribution chart
@@ -193,70 +187,19 @@ function createCardDistributionChart(creditCards, debitCards) {
     });
 }
 
-// Load credit card data
-function loadCreditCardData() {
-    // Load trend data
-    fetch(`/api/trend_data?card_type=credit&bank_type=${encodeURIComponent(currentFilters.bankType)}`)
-        .then(response => response.json())
-        .then(data => {
-            createTrendChart('credit-card-trend-chart', data, 'Credit Cards', '#0d6efd');
-        })
-        .catch(error => {
-            console.error('Error loading credit card trend data:', error);
-        });
-    
-    // Load top banks data
-    fetch(`/api/top_banks?card_type=credit&limit=10`)
-        .then(response => response.json())
-        .then(data => {
-            const tableBody = document.getElementById('top-credit-card-banks');
-            tableBody.innerHTML = '';
-            
-            data.forEach(bank => {
-                const row = document.createElement('tr');
-                row.innerHTML = `
-                    <td>${bank.bank_name}</td>
-                    <td>${formatNumber(bank.credit_cards)}</td>
-                `;
-                tableBody.appendChild(row);
-            });
-        })
-        .catch(error => {
-            console.error('Error loading top credit card banks:', error);
-        });
-}
-
-// Load debit card data
-function loadDebitCardData() {
-    // Load trend data
-    fetch(`/api/trend_data?card_type=debit&bank_type=${encodeURIComponent(currentFilters.bankType)}`)
-        .then(response => response.json())
-        .then(data => {
-            createTrendChart('debit-card-trend-chart', data, 'Debit Cards', '#198754');
-        })
-        .catch(error => {
-            console.error('Error loading debit card trend data:', error);
-        });
+// Fill a top banks table
+function renderTopBanks(tableId, banks, valueKey) {
+    const tableBody = document.getElementById(tableId);
+    tableBody.innerHTML = '';
     
-    // Load top banks data
-    fetch(`/api/top_banks?card_type=debit&limit=10`)
-        .then(response => response.json())
-        .then(data => {
-            const tableBody = document.getElementById('top-debit-card-banks');
-            tableBody.innerHTML = '';
-            
-            data.forEach(bank => {
-                const row = document.createElement('tr');
-                row.innerHTML = `
-                    <td>${bank.bank_name}</td>
-                    <td>${formatNumber(bank.debit_cards)}</td>
-                `;
-                tableBody.appendChild(row);
-            });
-        })
-        .catch(error => {
-            console.error('Error loading top debit card banks:', error);
-        });
+    banks.forEach(bank => {
+        const row = document.createElement('tr');
+        row.innerHTML = `
+            <td>${bank.bank_name}</td>
+            <td>${formatNumber(bank[valueKey])}</td>
+        `;
+        tableBody.appendChild(row);
+    });
 }
 
 // Create trend chart
@@ -315,18 +258,6 @@ function createTrendChart(canvasId, data, label, color) {
     });
 }
 
-// Load comparison data
-function loadComparisonData() {
-    fetch(`/api/comparison_data?bank_name=${encodeURIComponent(currentFilters.bank)}`)
-        .then(response => response.json())
-        .then(data => {
-            createComparisonChart(data);
-        })
-        .catch(error => {
-            console.error('Error loading comparison data:', error);
-        });
-}
-
 // Create comparison chart
 function createComparisonChart(data) {
     const ctx = document.getElementById('comparison-chart').getContext('2d');
@@ -391,29 +322,6 @@ function createComparisonChart(data) {
     });
 }
 
-// Load growth analysis data
-function loadGrowthAnalysisData() {
-    // Load credit card growth data
-    fetch(`/api/credit_card_data?bank_type=${encodeURIComponent(currentFilters.bankType)}&bank_name=${encodeURIComponent(currentFilters.bank)}&include_growth=true`)
-        .then(response => response.json())
-        .then(data => {
-            createGrowthChart('credit-card-growth-chart', data, 'Credit Card Growth (%)', '#0d6efd');
-        })
-        .catch(error => {
-            console.error('Error loading credit card growth data:', error);
-        });
-    
-    // Load debit card growth data
-    fetch(`/api/debit_card_data?bank_type=${encodeURIComponent(currentFilters.bankType)}&bank_name=${encodeURIComponent(currentFilters.bank)}&include_growth=true`)
-        .then(response => response.json())
-        .then(data => {
-            createGrowthChart('debit-card-growth-chart', data, 'Debit Card Growth (%)', '#198754');
-        })
-        .catch(error => {
-            console.error('Error loading debit card growth data:', error);
-        });
-}
-
 // Create growth chart
 function createGrowthChart(canvasId, data, label, color) {
     const ctx = document.getElementById(canvasId).getContext('2d');
@@ -0,0 +1,149 @@
+import time
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+from stats_store import METRIC_COLUMNS
+
+ROLLUP_KEYS = ['month', 'month_str', 'bank_type']
+
+def build_rollup(df):
+    """
+    In-memory monthly rollup: one row per (month, bank_type) with the bank
+    count and the sum of every metric column present in df
+    """
+    metrics = [col for col in METRIC_COLUMNS if col in df.columns]
+    # Sum downcast (compact mode) integers in 64 bits so totals cannot overflow
+    narrow = {col: 'int64' for col in metrics if df[col].dtype.kind == 'i' and df[col].dtype.itemsize < 8}
+    if narrow:
+        df = df.astype(narrow)
+    # Keep rows with a missing bank type or month so "All" totals still count them
+    rollup = df.groupby(ROLLUP_KEYS, sort=False, observed=True, dropna=False).agg(
+        bank_count=('bank_name', 'size'),
+        **{col: (col, 'sum') for col in metrics}
+    ).reset_index()
+    return rollup.sort_values(['month', 'bank_type'], ignore_index=True)
+
+def rollup_totals(rollup, columns, bank_type=None):
+    """Per-month_str totals of columns, optionally for one bank type"""
+    if bank_type and bank_type != 'All':
+        rollup = rollup[rollup['bank_type'] == bank_type]
+    return rollup.groupby('month_str')[columns].sum().reset_index()
+
+INDEX_COLUMNS = ['bank_type', 'bank_name', 'month_str']
+EMPTY_POSITIONS = np.array([], dtype=np.intp)
+
+def build_indexes(df):
+    """
+    Row-position index per value of bank_type, bank_name and month_str, plus
+    the sorted value lists the filters and dropdowns need
+    """
+    indexes = {col: df.groupby(col, sort=False, observed=True).indices for col in INDEX_COLUMNS if col in df.columns}
+    lists = {col: sorted(positions) for col, positions in indexes.items()}
+    banks_by_type = {}
+    if 'bank_type' in indexes and 'bank_name' in df.columns:
+        bank_names = df['bank_name'].to_numpy()
+        banks_by_type = {
+            bank_type: sorted(set(bank_names[positions]))
+            for bank_type, positions in indexes['bank_type'].items()
+        }
+    return {'positions': indexes, 'sorted': lists, 'banks_by_type': banks_by_type}
+
+def filter_rows(df, indexes, **filters):
+    """
+    Rows of df matching every column == value filter ('All' or empty means no
+    filter), in their original order, looked up through build_indexes
+    """
+    positions = None
+    for col, value in filters.items():
+        if not value or value == 'All':
+            continue
+        matches = indexes['positions'][col].get(value, EMPTY_POSITIONS)
+        positions = matches if positions is None else np.intersect1d(positions, matches, assume_unique=True)
+    if positions is None:
+        return df
+    return df.take(positions)
+
+def sort_by_month(df):
+    """df in stable month order, keeping its index labels; no copy when already sorted"""
+    if df['month'].is_monotonic_increasing:
+        return df
+    return df.sort_values('month', kind='stable')
+
+def build_growth(df):
+    """
+    Each bank's previous value (<metric>_previous) and month-on-month growth
+    in percent (<metric>_growth) for every metric in df, aligned with df's
+    rows. df may be in any row order; growth runs in month order
+    """
+    metrics = [col for col in METRIC_COLUMNS if col in df.columns]
+    ordered = sort_by_month(df)
+    values = ordered[metrics].astype('float64')
+    previous = values.groupby(ordered['bank_name'], sort=False, observed=True).shift(1)
+    growth = ((values - previous) / previous * 100).round(2)
+    result = pd.concat([previous.add_suffix('_previous'), growth.add_suffix('_growth')], axis=1)
+    return result if ordered is df else result.loc[df.index]
+
+CATEGORY_COLUMNS = ['bank_name', 'bank_type', 'month_str']
+
+def select_columns(df, columns):
+    """df restricted to columns, without copying when it already has exactly those"""
+    if list(df.columns) == columns:
+        return df
+    return df[columns]
+
+def compact_frame(df):
+    """
+    Categorical strings and the smallest integer dtypes that hold each metric.
+    Float metrics stay float64 so rupee values keep their precision
+    """
+    df = df.copy()
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    for col in df.select_dtypes(include='integer').columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    return df
+
+def memory_report(frames):
+    """Deep memory usage in bytes per frame and column; aliased frames are reported once"""
+    report = {}
+    seen = {}
+    for name, df in frames.items():
+        if df is None:
+            continue
+        if id(df) in seen:
+            report[name] = {'shared_with': seen[id(df)]}
+            continue
+        seen[id(df)] = name
+        usage = df.memory_usage(deep=True)
+        report[name] = {
+            'rows': len(df),
+            'total_bytes': int(usage.sum()),
+            'columns': {str(col): int(size) for col, size in usage.items()}
+        }
+    return report
+
+def average_growth_by_month(df):
+    """
+    Mean month-on-month growth per month_str over the rows that have one,
+    in chronological order (grouped on month, not the month_str label)
+    """
+    if 'growth' not in df.columns:
+        return pd.DataFrame(columns=['month_str', 'growth'])
+    growth = df['growth'].replace([np.inf, -np.inf], np.nan)
+    average = growth.groupby([df['month'], df['month_str']], observed=True).mean().dropna()
+    return average.rename('growth').reset_index().drop(columns='month')
+
+class PanelTimer:
+    """Server-side compute time per named dashboard panel, in milliseconds"""
+
+    def __init__(self):
+        self.timings = {}
+
+    @contextmanager
+    def __call__(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = round((time.perf_counter() - start) * 1000, 3)
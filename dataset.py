@@ -0,0 +1,71 @@
+import threading
+import logging
+from datetime import datetime
+from types import MappingProxyType
+
+logger = logging.getLogger(__name__)
+
+class DatasetSnapshot:
+    """
+    Read-only view of one complete data load. Requests keep the snapshot they
+    started with, so a concurrent refresh can never show them a mix of old
+    and new frames
+    """
+
+    __slots__ = ('_values', 'version', 'published_at')
+
+    def __init__(self, values, version):
+        object.__setattr__(self, '_values', MappingProxyType(dict(values)))
+        object.__setattr__(self, 'version', version)
+        object.__setattr__(self, 'published_at', datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("DatasetSnapshot is immutable")
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def get(self, key, default=None):
+        return self._values.get(key, default)
+
+class DatasetStore:
+    """
+    Holds the current DatasetSnapshot. New snapshots are built off to the side
+    and published by swapping one reference; loads are single-flight, so
+    concurrent cold requests wait for one load instead of each running it
+    """
+
+    def __init__(self):
+        self._snapshot = None
+        self._version = 0
+        self._load_lock = threading.Lock()
+        self._publish_lock = threading.Lock()
+
+    @property
+    def current(self):
+        """Current snapshot, or None before the first successful load"""
+        return self._snapshot
+
+    def publish(self, values, version=None):
+        """Install values as the new current snapshot, numbered version or the next local number"""
+        with self._publish_lock:
+            self._version = version if version is not None else self._version + 1
+            snapshot = DatasetSnapshot(values, self._version)
+            self._snapshot = snapshot
+        logger.info(f"Published dataset version {snapshot.version}")
+        return snapshot
+
+    def get_or_load(self, load):
+        """Current snapshot, calling load() once if there is none yet"""
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        with self._load_lock:
+            if self._snapshot is None:
+                load()
+            return self._snapshot
+
+    def reload(self, load):
+        """Run load() with no other load in flight; returns its result"""
+        with self._load_lock:
+            return load()
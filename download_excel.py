@@ -1,39 +1,18 @@
 import os
 import time
-import requests
-from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
+from http_cache import HTTPCache
+from downloader import DownloadManager
+from update_checker import RBI_LISTING_URL, fetch_excel_listing, listing_cache
 
 def download_rbi_excel_files():
     """
-    Download all Excel files from the RBI ATM/POS/Card Statistics page using Playwright
+    Download all Excel files from the RBI ATM/POS/Card Statistics page
     """
     print("Starting download of RBI Excel files...")
     
-    # Use Playwright instead of Selenium
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        
-        # Navigate to the RBI page
-        page.goto("https://www.rbi.org.in/Scripts/ATMView.aspx")
-        page.wait_for_load_state("networkidle")
-        
-        # Get the page content
-        html_content = page.content()
-        browser.close()
-    
-    # Parse with BeautifulSoup
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
-    # Find all Excel download links
-    excel_links = []
-    for a in soup.find_all("a", href=True):
-        href = a["href"]
-        if href.lower().endswith((".xls", ".xlsx")):
-            full_url = href if href.startswith("http") else "https://www.rbi.org.in" + href
-            filename = full_url.split("/")[-1]
-            excel_links.append((full_url, filename))
+    # Plain HTTP first; the shared headless browser is only used as a fallback
+    excel_links, info = listing_cache.get(RBI_LISTING_URL, fetch_excel_listing)
+    print(f"Listed Excel files via {info['method']} in {info['seconds']}s")
     
     print(f"Found {len(excel_links)} Excel files to download")
     
@@ -41,21 +20,29 @@ def download_rbi_excel_files():
     download_dir = os.path.join(os.getcwd(), "RBI_ATM_Excel")
     os.makedirs(download_dir, exist_ok=True)
     
-    downloaded_files = []
-    for url, filename in excel_links:
-        print(f"📥 Downloading: {filename}")
-        try:
-            r = requests.get(url)
-            r.raise_for_status()
-            file_path = os.path.join(download_dir, filename)
-            with open(file_path, "wb") as f:
-                f.write(r.content)
-            downloaded_files.append(file_path)
-            print(f"✅ Successfully downloaded {filename}")
-        except Exception as e:
-            print(f"❌ Failed to download {filename}: {e}")
+    # Conditional GETs: files unchanged on the server are not downloaded again
+    http_cache = HTTPCache(os.path.join(os.getcwd(), "http_cache"))
+    
+    def show_progress(done, total, url, file_path, result, error):
+        filename = os.path.basename(file_path)
+        if error:
+            print(f"❌ [{done}/{total}] Failed to download {filename}: {error}")
+        elif result.not_modified:
+            print(f"♻️ [{done}/{total}] {filename} unchanged, keeping local copy")
+        else:
+            print(f"✅ [{done}/{total}] Downloaded {filename}")
+    
+    # Parallel downloads over one keep-alive session, rate limited per host
+    jobs = [(url, os.path.join(download_dir, filename)) for url, filename in excel_links]
+    with DownloadManager(http_cache) as manager:
+        downloaded_files = [
+            file_path for url, file_path, result, error in manager.download_all(jobs, show_progress)
+            if not error and not result.not_modified
+        ]
     
-    print(f"Download complete. {len(downloaded_files)} files downloaded.")
+    report = manager.report
+    print(f"Download complete. {len(downloaded_files)} files downloaded, {report['bytes']} bytes "
+          f"in {report['seconds']}s ({report['mb_per_second']} MB/s). HTTP cache: {http_cache.stats()}")
     return downloaded_files
 
 if __name__ == "__main__":
@@ -0,0 +1,269 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import zipfile
+import requests
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from rate_limiter import HostRateLimiter
+from http_cache import create_session
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+DEFAULT_RETRIES = 3
+
+# Parallel backfill defaults; rate is requests per second per host
+DEFAULT_WORKERS = 4
+DEFAULT_RATE = 1.0
+DEFAULT_BURST = 2
+DEFAULT_MAX_IN_FLIGHT = 4
+
+class DownloadError(Exception):
+    """A download finished but failed verification"""
+
+class DownloadResult:
+    """Outcome of download_file"""
+
+    def __init__(self, url, path, not_modified=False, size=0, sha256=None, resumed_from=0):
+        self.url = url
+        self.path = path
+        self.not_modified = not_modified
+        self.size = size
+        self.sha256 = sha256
+        self.resumed_from = resumed_from
+
+def _fsync_dir(path):
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def _load_part_meta(meta_path):
+    try:
+        with open(meta_path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _expected_size(response):
+    """Full file size announced by the server, if any"""
+    if response.status_code == 206:
+        content_range = response.headers.get('Content-Range', '')
+        total = content_range.rsplit('/', 1)[-1]
+        return int(total) if total.isdigit() else None
+    length = response.headers.get('Content-Length')
+    return int(length) if length and length.isdigit() else None
+
+def _range_start(response):
+    """First byte offset of a 206 response's Content-Range, if it has one"""
+    content_range = response.headers.get('Content-Range', '')
+    if not content_range.startswith('bytes '):
+        return None
+    start = content_range[len('bytes '):].split('-', 1)[0]
+    return int(start) if start.isdigit() else None
+
+def _verify(file_path, part_path, size, expected_size):
+    if expected_size is not None and size != expected_size:
+        raise DownloadError(f"size mismatch: got {size} bytes, expected {expected_size}")
+    if file_path.lower().endswith(".xlsx") and not zipfile.is_zipfile(part_path):
+        raise DownloadError("not a valid .xlsx workbook")
+
+def download_file(url, file_path, http_cache=None, session=None, timeout=30,
+                  chunk_size=CHUNK_SIZE, retries=DEFAULT_RETRIES, limiter=None):
+    """
+    Stream url to file_path through a sibling .part file and atomically rename it
+    into place once it has been fsynced and verified, so the parser never sees a
+    partial workbook. Interrupted transfers resume with an HTTP Range request when
+    the server still serves the same version. With http_cache an existing file is
+    revalidated with a conditional GET and the new validators are recorded.
+    With a HostRateLimiter each attempt takes a slot, released before any retry backoff
+    """
+    part_path = file_path + ".part"
+    meta_path = part_path + ".json"
+    http = session or requests
+
+    for attempt in range(retries + 1):
+        part_meta = _load_part_meta(meta_path)
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        validator = part_meta.get('etag') or part_meta.get('last_modified')
+        if offset and not validator:
+            # Cannot prove the partial bytes belong to the current version
+            os.remove(part_path)
+            offset = 0
+
+        # Sizes are checked against Content-Length, so ask for the bytes as stored
+        headers = {'Accept-Encoding': 'identity'}
+        if http_cache and os.path.exists(file_path):
+            headers.update(http_cache.conditional_headers(url))
+        if offset:
+            headers['Range'] = f"bytes={offset}-"
+            headers['If-Range'] = validator
+
+        try:
+            with limiter.request(url) if limiter else nullcontext():
+                response = http.get(url, headers=headers, timeout=timeout, stream=True)
+                try:
+                    if response.status_code == 304 and http_cache:
+                        http_cache.mark_not_modified(url)
+                        for path in (part_path, meta_path):
+                            if os.path.exists(path):
+                                os.remove(path)
+                        return DownloadResult(url, file_path, not_modified=True)
+                    if response.status_code == 416:
+                        # Stale partial file; start again from scratch
+                        if os.path.exists(part_path):
+                            os.remove(part_path)
+                        continue
+                    response.raise_for_status()
+
+                    resumed = response.status_code == 206
+                    if resumed and _range_start(response) != offset:
+                        # Not the bytes that follow the partial file; start again from scratch
+                        logger.warning(f"Unexpected Content-Range {response.headers.get('Content-Range')!r} "
+                                       f"resuming {url} from byte {offset}")
+                        if os.path.exists(part_path):
+                            os.remove(part_path)
+                        continue
+                    if not resumed:
+                        offset = 0
+                    with open(meta_path, 'w') as f:
+                        json.dump({
+                            'url': url,
+                            'etag': response.headers.get('ETag'),
+                            'last_modified': response.headers.get('Last-Modified')
+                        }, f)
+
+                    digest = hashlib.sha256()
+                    mode = 'r+b' if resumed else 'wb'
+                    with open(part_path, mode) as f:
+                        if resumed:
+                            # Re-hash the bytes kept from the interrupted transfer
+                            for chunk in iter(lambda: f.read(chunk_size), b''):
+                                digest.update(chunk)
+                        for chunk in response.iter_content(chunk_size=chunk_size):
+                            if chunk:
+                                f.write(chunk)
+                                digest.update(chunk)
+                        f.flush()
+                        os.fsync(f.fileno())
+                        size = f.tell()
+                finally:
+                    response.close()
+        except requests.RequestException as e:
+            if attempt == retries or (getattr(e, 'response', None) is not None and e.response.status_code < 500):
+                raise
+            logger.warning(f"Download of {url} interrupted ({str(e)}), resuming")
+            time.sleep(2 ** attempt)
+            continue
+
+        sha256 = digest.hexdigest()
+        try:
+            _verify(file_path, part_path, size, _expected_size(response))
+        except DownloadError:
+            os.remove(part_path)
+            os.remove(meta_path)
+            raise
+
+        os.replace(part_path, file_path)
+        _fsync_dir(os.path.dirname(os.path.abspath(file_path)))
+        os.remove(meta_path)
+        if http_cache:
+            http_cache.mark_downloaded(url, response)
+        if offset:
+            logger.info(f"Resumed {url} from byte {offset}")
+        return DownloadResult(url, file_path, size=size, sha256=sha256, resumed_from=offset)
+
+    raise DownloadError(f"could not download {url}")
+
+class DownloadManager:
+    """
+    Runs download_file for many files over one pooled Session with bounded
+    parallelism and per-host rate limiting, and reports progress and throughput.
+    Use it as a context manager (or call close()) to release a session it created
+    """
+
+    def __init__(self, http_cache=None, max_workers=DEFAULT_WORKERS, rate=DEFAULT_RATE,
+                 burst=DEFAULT_BURST, max_in_flight=DEFAULT_MAX_IN_FLIGHT, session=None):
+        self.http_cache = http_cache
+        self.max_workers = max_workers
+        self.limiter = HostRateLimiter(rate=rate, burst=burst, max_in_flight=max_in_flight)
+        self._owns_session = session is None
+        self.session = session or create_session(max_workers)
+        self.report = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the session, unless the caller passed it in"""
+        if self._owns_session:
+            self.session.close()
+
+    def _download(self, url, file_path):
+        start = time.perf_counter()
+        result = download_file(url, file_path, self.http_cache, session=self.session, limiter=self.limiter)
+        return result, time.perf_counter() - start
+
+    def download_all(self, jobs, on_progress=None):
+        """
+        Download every (url, file_path) in jobs. Returns (url, file_path, result, error)
+        per job in input order; one failed file never stops the rest. Only the first
+        job for each file_path runs, so two workers never write the same file.
+        on_progress(done, total, url, file_path, result, error) runs as each job finishes
+        """
+        unique = {}
+        for url, file_path in jobs:
+            if file_path in unique:
+                logger.warning(f"Skipping duplicate download of {os.path.basename(file_path)} from {url}")
+                continue
+            unique[file_path] = (url, file_path)
+        jobs = list(unique.values())
+        outcomes = {}
+        total_bytes = 0
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self._download, url, file_path): (url, file_path)
+                for url, file_path in jobs
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                url, file_path = futures[future]
+                result, error = None, None
+                try:
+                    result, elapsed = future.result()
+                    total_bytes += result.size
+                    logger.info(f"[{done}/{len(jobs)}] {os.path.basename(file_path)}: "
+                                f"{'not modified' if result.not_modified else f'{result.size} bytes'} in {elapsed:.2f}s")
+                except Exception as e:
+                    error = str(e)
+                    logger.error(f"[{done}/{len(jobs)}] {os.path.basename(file_path)} failed: {error}")
+                outcomes[(url, file_path)] = (url, file_path, result, error)
+                if on_progress:
+                    on_progress(done, len(jobs), url, file_path, result, error)
+
+        elapsed = time.perf_counter() - start
+        results = [outcomes[job] for job in jobs]
+        self.report = {
+            'files': len(jobs),
+            'downloaded': sum(1 for _, _, r, _ in results if r and not r.not_modified),
+            'not_modified': sum(1 for _, _, r, _ in results if r and r.not_modified),
+            'failed': sum(1 for _, _, _, e in results if e),
+            'bytes': total_bytes,
+            'seconds': round(elapsed, 2),
+            'mb_per_second': round(total_bytes / elapsed / 1e6, 2) if elapsed else 0.0
+        }
+        logger.info(f"Download report: {self.report}")
+        return results
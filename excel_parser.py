@@ -4,84 +4,245 @@ import pandas as pd
 import os
 import re
 from datetime import datetime
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from openpyxl import load_workbook
+from parse_cache import ParseCache, file_sha256
+
+# Bump whenever parsed output changes; invalidates every parse cache entry
+PARSER_VERSION = 3
+
+# Typed columns of every parsed batch, in order
+INT_COLUMNS = [
+    "credit_cards", "debit_cards", "atm_onsite", "atm_offsite", "pos_terminals",
+    "micro_atms", "bharat_qr_codes", "upi_qr_codes", "pos_txn_volume", "online_txn_volume"
+]
+FLOAT_COLUMNS = ["pos_txn_value", "online_txn_value"]
+BATCH_COLUMNS = ["bank_name", "bank_type", "month", "month_str"] + INT_COLUMNS + FLOAT_COLUMNS
+
+# Workbook formats openpyxl can read; the update checker downloads only these
+EXCEL_EXTENSIONS = (".xlsx",)
+
+# Rows scanned for the "Bank Name" header and rows making up the multi-row header
+HEADER_SCAN_ROWS = 10
+HEADER_ROWS = 3
 
 class RBIExcelParser:
-    def __init__(self, excel_dir):
+    def __init__(self, excel_dir, workers=1, cache_dir=None):
         self.excel_dir = excel_dir
+        self.workers = workers
+        self.cache = ParseCache(cache_dir, PARSER_VERSION) if cache_dir else None
+        self.file_timings = {}
+        self.file_records = {}
+        self.file_months = {}
+        self.file_errors = {}
 
-    def process_all_files(self):
+    def get_excel_files(self):
+        return sorted(f for f in os.listdir(self.excel_dir) if is_supported_workbook(f))
+
+    def process_all_files(self, workers=None):
         all_data = []
-        for file_name in os.listdir(self.excel_dir):
-            if file_name.endswith(".xlsx"):
-                file_path = os.path.join(self.excel_dir, file_name)
-                try:
-                    df = self.parse_excel(file_path)
-                    month_str = self.extract_month_from_filename(file_name)
-                    df["month_str"] = month_str
-                    df["month"] = self.convert_month_to_date(month_str)
-                    df["bank_type"] = "Scheduled Commercial Bank"  # Fallback value; can update
-
-                    # Rename for consistency with DB fields
-                    df = df.rename(columns={
-                        "Bank Name": "bank_name",
-                        "Credit Cards Outstanding": "credit_cards",
-                        "Debit Cards Outstanding": "debit_cards"
-                    })
-
-                    # Add other fields with 0 default
-                    df["atm_onsite"] = 0
-                    df["atm_offsite"] = 0
-                    df["pos_terminals"] = 0
-                    df["micro_atms"] = 0
-                    df["bharat_qr_codes"] = 0
-                    df["upi_qr_codes"] = 0
-                    df["pos_txn_volume"] = 0
-                    df["pos_txn_value"] = 0
-                    df["online_txn_volume"] = 0
-                    df["online_txn_value"] = 0
-
-                    all_data.extend(df.to_dict(orient="records"))
-                except Exception as e:
-                    print(f"❌ Error parsing {file_name}: {e}")
+        for df in self.process_all_batches(workers):
+            all_data.extend(df.to_dict(orient="records"))
         return all_data
 
+    def process_all_batches(self, workers=None, file_names=None):
+        """
+        Parse every workbook (or just file_names) into one typed DataFrame
+        per file (columns in BATCH_COLUMNS), ordered by month
+        """
+        workers = workers or self.workers
+        file_names = self.get_excel_files() if file_names is None else sorted(file_names)
+
+        # Serve unchanged workbooks from the parse cache
+        results = []
+        hashes = {}
+        cached = set()
+        to_parse = file_names
+        if self.cache:
+            to_parse = []
+            for file_name in file_names:
+                hashes[file_name] = file_sha256(os.path.join(self.excel_dir, file_name))
+                df = self.cache.get(file_name, hashes[file_name])
+                if df is None:
+                    to_parse.append(file_name)
+                else:
+                    print(f"♻️ Loaded {file_name} from parse cache")
+                    cached.add(file_name)
+                    results.append((file_name, df, 0.0, None))
+
+        if workers > 1 and len(to_parse) > 1:
+            parsed = self.process_files_parallel(to_parse, workers)
+        else:
+            parsed = [parse_file_task(self.excel_dir, file_name) for file_name in to_parse]
+        results.extend(parsed)
+
+        if self.cache:
+            for file_name, df, _, error in parsed:
+                if not error:
+                    self.cache.put(file_name, hashes[file_name], df)
+            self.cache.evict_missing(self.get_excel_files())
+            self.cache.save()
+
+        # Merge deterministically by month, whatever order the files finished in
+        results.sort(key=lambda result: (self.month_sort_key(result[0]), result[0]))
+
+        batches = []
+        self.file_timings = {}
+        self.file_records = {}
+        self.file_months = {}
+        self.file_errors = {}
+        for file_name, df, elapsed, error in results:
+            self.file_timings[file_name] = elapsed
+            if error:
+                self.file_errors[file_name] = error
+                print(f"❌ Error parsing {file_name}: {error}")
+                continue
+            if file_name not in cached:
+                print(f"⏱️ Parsed {file_name} in {elapsed:.2f}s ({len(df)} rows)")
+            self.file_records[file_name] = len(df)
+            if len(df):
+                self.file_months[file_name] = df["month"].iloc[0]
+            batches.append(df)
+        return batches
+
+    def process_files_parallel(self, file_names, workers):
+        results = []
+        remaining = list(file_names)
+        isolate = False
+        while remaining:
+            # After a worker crash, parse what is left one file at a time so
+            # the next crash can be pinned on the file that caused it
+            with ProcessPoolExecutor(max_workers=1 if isolate else workers) as executor:
+                futures = [
+                    (file_name, executor.submit(parse_file_task, self.excel_dir, file_name))
+                    for file_name in remaining
+                ]
+                remaining = []
+                for i, (file_name, future) in enumerate(futures):
+                    try:
+                        results.append(future.result())
+                    except BrokenProcessPool as e:
+                        if isolate:
+                            # Files run in order, so this one killed the worker
+                            results.append((file_name, None, 0.0, str(e)))
+                            remaining = [name for name, _ in futures[i + 1:]]
+                            break
+                        # A crash fails every outstanding future; retry them
+                        remaining.append(file_name)
+                    except Exception as e:
+                        results.append((file_name, None, 0.0, str(e)))
+            isolate = True
+        return results
+
+    def process_file(self, file_name):
+        file_path = os.path.join(self.excel_dir, file_name)
+        df = self.parse_excel(file_path)
+        month_str = self.extract_month_from_filename(file_name)
+        df["month_str"] = month_str
+        df["month"] = self.convert_month_to_date(month_str)
+        df["bank_type"] = "Scheduled Commercial Bank"  # Fallback value; can update
+
+        # Rename for consistency with DB fields
+        df = df.rename(columns={
+            "Bank Name": "bank_name",
+            "Credit Cards Outstanding": "credit_cards",
+            "Debit Cards Outstanding": "debit_cards"
+        })
+
+        # Add other fields with 0 default
+        df["atm_onsite"] = 0
+        df["atm_offsite"] = 0
+        df["pos_terminals"] = 0
+        df["micro_atms"] = 0
+        df["bharat_qr_codes"] = 0
+        df["upi_qr_codes"] = 0
+        df["pos_txn_volume"] = 0
+        df["pos_txn_value"] = 0
+        df["online_txn_volume"] = 0
+        df["online_txn_value"] = 0
+        return self.normalise_batch(df)
+
+    def normalise_batch(self, df):
+        """Coerce a parsed file to the typed BATCH_COLUMNS layout, keeping missing cells as NA"""
+        df = df[BATCH_COLUMNS].copy()
+        df["bank_name"] = df["bank_name"].astype(str).str.strip()
+        df["month"] = pd.to_datetime(df["month"])
+        for col in INT_COLUMNS:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+        for col in FLOAT_COLUMNS:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
+        return df
+
+    def month_sort_key(self, file_name):
+        month_str = self.extract_month_from_filename(file_name)
+        if month_str == "Unknown":
+            return datetime.max
+        return self.convert_month_to_date(month_str)
+
     def parse_excel(self, file_path):
-        # Step 1: Preview to find header row
-        preview = pd.read_excel(file_path, header=None, nrows=10)
-        header_row_idx = None
-        for i in range(len(preview)):
-            if preview.iloc[i].astype(str).str.contains("Bank Name", case=False).any():
-                header_row_idx = i
-                break
-        if header_row_idx is None:
-            raise ValueError("❌ Could not find header row with 'Bank Name'")
-
-        # Step 2: Read 3 rows for header
-        header_rows = pd.read_excel(file_path, header=None, skiprows=header_row_idx, nrows=3)
-        multi_header = header_rows.ffill(axis=1).astype(str)
-        combined_header = multi_header.apply(lambda x: ' '.join(x).strip().lower(), axis=0)
-
-        # Step 3: Read actual data
-        df = pd.read_excel(file_path, header=None, skiprows=header_row_idx + 3)
-
-        # Step 4: Fix headers if mismatched
-        if len(combined_header) > len(df.columns):
-            combined_header = combined_header[:len(df.columns)]
-        elif len(combined_header) < len(df.columns):
-            combined_header = combined_header.tolist() + [f"extra_col_{i}" for i in range(len(df.columns) - len(combined_header))]
-
-        df.columns = combined_header
-
-        # Step 5: Identify columns
-        bank_col = [col for col in df.columns if "bank name" in col][0]
-        credit_col = [col for col in df.columns if "credit card" in col][0]
-        debit_col = [col for col in df.columns if "debit card" in col][0]
-
-        df_filtered = df[[bank_col, credit_col, debit_col]].dropna(subset=[bank_col])
-        df_filtered.columns = ["Bank Name", "Credit Cards Outstanding", "Debit Cards Outstanding"]
-        df_filtered = df_filtered.reset_index(drop=True)
-
-        return df_filtered
+        rows = list(self.stream_excel(file_path))
+        return pd.DataFrame(rows, columns=["Bank Name", "Credit Cards Outstanding", "Debit Cards Outstanding"])
+
+    def stream_excel(self, file_path):
+        """
+        Open the workbook once in read-only mode and yield
+        (bank_name, credit_cards, debit_cards) for every data row
+        """
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            rows = workbook.worksheets[0].iter_rows(values_only=True)
+
+            # Step 1: Scan the first rows for the header row
+            header_rows = []
+            for i, row in enumerate(rows):
+                if any("bank name" in str(value).lower() for value in row if value is not None):
+                    header_rows.append(row)
+                    break
+                if i + 1 >= HEADER_SCAN_ROWS:
+                    break
+            if not header_rows:
+                raise ValueError("❌ Could not find header row with 'Bank Name'")
+
+            # Step 2: Combine the multi-row header
+            for row in rows:
+                header_rows.append(row)
+                if len(header_rows) == HEADER_ROWS:
+                    break
+            combined_header = self.combine_header(header_rows)
+
+            # Step 3: Identify columns
+            bank_idx = [i for i, col in enumerate(combined_header) if "bank name" in col][0]
+            credit_idx = [i for i, col in enumerate(combined_header) if "credit card" in col][0]
+            debit_idx = [i for i, col in enumerate(combined_header) if "debit card" in col][0]
+
+            # Step 4: Stream data rows
+            for row in rows:
+                bank_name = row[bank_idx] if bank_idx < len(row) else None
+                if bank_name is None:
+                    continue
+                credit = row[credit_idx] if credit_idx < len(row) else None
+                debit = row[debit_idx] if debit_idx < len(row) else None
+                yield bank_name, credit, debit
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def combine_header(header_rows):
+        """Forward-fill each header row and join the rows column-wise into lowercase labels"""
+        width = max(len(row) for row in header_rows)
+        filled_rows = []
+        for row in header_rows:
+            filled = []
+            last = None
+            for i in range(width):
+                value = row[i] if i < len(row) else None
+                if value is not None:
+                    last = value
+                filled.append(str(last) if last is not None else "nan")
+            filled_rows.append(filled)
+        return [" ".join(parts).strip().lower() for parts in zip(*filled_rows)]
 
     def extract_month_from_filename(self, filename):
         match = re.search(r"ATM([A-Z]+)(\d{4})", filename)
@@ -96,3 +257,19 @@ class RBIExcelParser:
             return datetime.strptime(month_str, "%B-%Y")
         except:
             return datetime.now()
+
+def is_supported_workbook(file_name):
+    """True when the parser can read file_name"""
+    return file_name.lower().endswith(EXCEL_EXTENSIONS)
+
+def parse_file_task(excel_dir, file_name):
+    """
+    Parse a single workbook; runs in a worker process in parallel mode.
+    Returns (file_name, df, elapsed_seconds, error) so one bad file never fails the batch
+    """
+    start = time.perf_counter()
+    try:
+        df = RBIExcelParser(excel_dir).process_file(file_name)
+        return file_name, df, time.perf_counter() - start, None
+    except Exception as e:
+        return file_name, None, time.perf_counter() - start, str(e)
@@ -0,0 +1,79 @@
+import os
+import json
+import logging
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the cached frames change shape or dtype
+FRAME_CACHE_VERSION = 1
+
+def source_signature(paths):
+    """(mtime, size) of every source file; the cache is only valid while these match"""
+    signature = {}
+    for name, path in paths.items():
+        stat = os.stat(path)
+        signature[name] = [stat.st_mtime, stat.st_size]
+    return signature
+
+class FrameCache:
+    """
+    Typed Feather (Arrow IPC) copies of DataFrames loaded from slower sources,
+    one <name>.feather per frame, read back memory-mapped. manifest.json records
+    the source signature; it is written last so a partial save is never used
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.manifest_path = os.path.join(cache_dir, "manifest.json")
+
+    @property
+    def available(self):
+        return feather is not None
+
+    def _frame_path(self, name):
+        return os.path.join(self.cache_dir, name + ".feather")
+
+    def load(self, names, signature):
+        """Frames by name, or None when pyarrow is missing or the cache is stale"""
+        if not self.available:
+            return None
+        try:
+            with open(self.manifest_path, 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get('version') != FRAME_CACHE_VERSION or manifest.get('sources') != signature:
+            return None
+        try:
+            return {
+                name: feather.read_table(self._frame_path(name), memory_map=True).to_pandas()
+                for name in names
+            }
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable frame cache: {str(e)}")
+            return None
+
+    def save(self, frames, signature):
+        """Write frames and then the manifest, each atomically"""
+        if not self.available:
+            return False
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            if os.path.exists(self.manifest_path):
+                os.remove(self.manifest_path)
+            for name, df in frames.items():
+                path = self._frame_path(name)
+                feather.write_feather(df.reset_index(drop=True), path + ".tmp", compression='uncompressed')
+                os.replace(path + ".tmp", path)
+            with open(self.manifest_path + ".tmp", 'w') as f:
+                json.dump({'version': FRAME_CACHE_VERSION, 'sources': signature}, f)
+            os.replace(self.manifest_path + ".tmp", self.manifest_path)
+            return True
+        except Exception as e:
+            logger.warning(f"Could not write frame cache: {str(e)}")
+            return False
@@ -0,0 +1,219 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+DEFAULT_POOL_SIZE = 4
+
+def create_session(pool_size=DEFAULT_POOL_SIZE):
+    """requests.Session with a keep-alive pool sized for pool_size concurrent requests"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+class CachedResponse:
+    """
+    Result of HTTPCache.get: the body (from the network or the cache) and
+    whether the server answered 304 Not Modified
+    """
+
+    def __init__(self, url, status_code, content, not_modified, encoding=None):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.not_modified = not_modified
+        self.encoding = encoding or 'utf-8'
+
+    @property
+    def text(self):
+        if self.content is None:
+            return None
+        return self.content.decode(self.encoding, errors='replace')
+
+    def raise_for_status(self):
+        pass
+
+class HTTPCache:
+    """
+    On-disk conditional-GET cache. Stores ETag/Last-Modified and the body per
+    URL, revalidates with If-None-Match/If-Modified-Since and keeps the total
+    body size under max_bytes by evicting the least recently used entries
+    """
+
+    def __init__(self, cache_dir="http_cache", max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'misses': 0, 'evictions': 0}
+        # Responses fetched with defer_store=True, awaiting commit() or discard()
+        self._pending = {}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _key(self, url):
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _meta_path(self, url):
+        return os.path.join(self.cache_dir, self._key(url) + ".json")
+
+    def _body_path(self, url):
+        return os.path.join(self.cache_dir, self._key(url) + ".body")
+
+    def load_meta(self, url):
+        try:
+            with open(self._meta_path(url), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, url, meta):
+        path = self._meta_path(url)
+        with open(path + ".tmp", 'w') as f:
+            json.dump(meta, f)
+        os.replace(path + ".tmp", path)
+
+    def conditional_headers(self, url):
+        """Validator headers for url, if it has been cached before"""
+        meta = self.load_meta(url)
+        headers = {}
+        if meta:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def get(self, url, session=None, timeout=30, store_body=True, conditional=True, defer_store=False):
+        """
+        GET url, revalidating any cached copy. On 304 the cached body is returned
+        with not_modified=True (content is None when stored with store_body=False).
+        With defer_store a new response is only cached once commit(url) is called,
+        so content that was never processed is fetched again next time
+        """
+        meta = self.load_meta(url) if conditional else None
+        has_body = bool(meta and meta.get('has_body') and os.path.exists(self._body_path(url)))
+        # Without a stored body a 304 is only useful when the caller keeps its own copy
+        if meta and meta.get('has_body') and not has_body:
+            meta = None
+
+        headers = self.conditional_headers(url) if meta else {}
+        response = (session or requests).get(url, headers=headers, timeout=timeout)
+
+        if response.status_code == 304 and meta:
+            content = None
+            if has_body:
+                with open(self._body_path(url), 'rb') as f:
+                    content = f.read()
+            meta['accessed'] = time.time()
+            self._write_meta(url, meta)
+            with self._lock:
+                self.counters['hits'] += 1
+            return CachedResponse(url, 304, content, True, meta.get('encoding'))
+
+        response.raise_for_status()
+        with self._lock:
+            self.counters['misses'] += 1
+            if defer_store:
+                self._pending[url] = (response, store_body)
+        if not defer_store:
+            self.store(url, response, store_body)
+        return CachedResponse(url, response.status_code, response.content, False, response.encoding)
+
+    def store(self, url, response, store_body=True):
+        """Record the validators (and optionally the body) of a successful response"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            # Nothing to revalidate against
+            return
+
+        if store_body:
+            body_path = self._body_path(url)
+            with open(body_path + ".tmp", 'wb') as f:
+                f.write(response.content)
+            os.replace(body_path + ".tmp", body_path)
+        self._write_meta(url, {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'encoding': response.encoding,
+            'has_body': store_body,
+            'size': len(response.content) if store_body else 0,
+            'accessed': time.time()
+        })
+        if store_body:
+            self.evict()
+
+    def mark_not_modified(self, url):
+        """Count a 304 answered to a request the caller made with conditional_headers"""
+        meta = self.load_meta(url)
+        if meta:
+            meta['accessed'] = time.time()
+            self._write_meta(url, meta)
+        with self._lock:
+            self.counters['hits'] += 1
+
+    def mark_downloaded(self, url, response):
+        """Count a full download the caller streamed itself and keep its validators"""
+        with self._lock:
+            self.counters['misses'] += 1
+        self.store(url, response, store_body=False)
+
+    def commit(self, url):
+        """Cache the response get(defer_store=True) held back for url, now that it has been processed"""
+        with self._lock:
+            pending = self._pending.pop(url, None)
+        if pending:
+            self.store(url, *pending)
+
+    def discard(self, url):
+        """Drop the response held back for url without caching it"""
+        with self._lock:
+            self._pending.pop(url, None)
+
+    def invalidate(self, url):
+        """Forget url so the next get downloads it in full"""
+        for path in (self._meta_path(url), self._body_path(url)):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def evict(self):
+        """Drop least recently used entries until the stored bodies fit in max_bytes"""
+        with self._lock:
+            entries = []
+            total = 0
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith(".json"):
+                    continue
+                try:
+                    with open(os.path.join(self.cache_dir, name), 'r') as f:
+                        meta = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                entries.append(meta)
+                total += meta.get('size', 0)
+
+            for meta in sorted(entries, key=lambda m: m.get('accessed', 0)):
+                if total <= self.max_bytes:
+                    break
+                if not meta.get('size'):
+                    continue
+                self.invalidate(meta['url'])
+                total -= meta['size']
+                self.counters['evictions'] += 1
+                logger.info(f"Evicted {meta['url']} from HTTP cache")
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+        requests_made = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / requests_made, 3) if requests_made else 0.0
+        return stats
@@ -0,0 +1,31 @@
+from src.models.db import db
+from datetime import datetime
+
+class IngestManifest(db.Model):
+    """
+    Model recording each RBI month page that has been ingested
+    """
+    __tablename__ = 'ingest_manifest'
+    
+    manifest_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    source_url = db.Column(db.String(500), nullable=False, unique=True)
+    month = db.Column(db.Date, nullable=False)
+    is_revised = db.Column(db.Boolean, default=False)
+    fingerprint = db.Column(db.String(64), nullable=False)  # SHA-256 of the parsed bank rows (of the file for Excel downloads)
+    ingested_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<IngestManifest {self.month} {self.source_url}>'
+    
+    def to_dict(self):
+        """
+        Convert manifest entry to dictionary
+        """
+        return {
+            'manifest_id': self.manifest_id,
+            'source_url': self.source_url,
+            'month': self.month.strftime('%Y-%m'),
+            'is_revised': self.is_revised,
+            'fingerprint': self.fingerprint,
+            'ingested_at': self.ingested_at.isoformat()
+        }
@@ -0,0 +1,37 @@
+from src.models.db import db
+from src.models.monthly_statistic import MonthlyStatistic
+
+class MetricGrowth(db.Model):
+    """
+    Model for storing precomputed month-on-month growth of one metric for a
+    bank, relative to the bank's previous statistics row
+    """
+    __tablename__ = 'metric_growth'
+    __table_args__ = (
+        db.Index('ix_metric_growth_lookup', 'metric', 'bank_id', 'month'),
+    )
+    
+    growth_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    bank_id = db.Column(db.Integer, db.ForeignKey('banks.bank_id'), nullable=False)
+    metric = db.Column(db.String(50), nullable=False)
+    month = db.Column(db.Date, nullable=False)
+    previous_month = db.Column(db.Date, nullable=False)
+    value = db.Column(db.Float, nullable=False)
+    previous_value = db.Column(db.Float, nullable=False)
+    growth_percentage = db.Column(db.Float, nullable=False)
+    
+    def __repr__(self):
+        return f'<MetricGrowth {self.bank_id} {self.metric} - {self.month}>'
+    
+    def to_dict(self):
+        """
+        Convert growth entry to dictionary; values of integer metrics stay integers
+        """
+        integer = isinstance(MonthlyStatistic.__table__.c[self.metric].type, db.Integer)
+        cast = int if integer else float
+        return {
+            'month': self.month.strftime('%Y-%m'),
+            'value': cast(self.value),
+            'previous_value': cast(self.previous_value),
+            'growth_percentage': self.growth_percentage
+        }
@@ -0,0 +1,90 @@
+import os
+import json
+import hashlib
+import pandas as pd
+
+def file_sha256(file_path, chunk_size=1024 * 1024):
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ParseCache:
+    """
+    Persistent cache of parsed workbooks, keyed by file SHA-256 and parser version.
+    Each entry is the normalised DataFrame for one workbook, pickled to <sha256>.pkl
+    """
+
+    def __init__(self, cache_dir, parser_version):
+        self.cache_dir = cache_dir
+        self.parser_version = parser_version
+        self.index_path = os.path.join(cache_dir, "index.json")
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self.index = self.load_index()
+        if self.index.get("parser_version") != parser_version:
+            # Parser output may have changed shape; nothing cached can be trusted
+            self.clear()
+
+    def load_index(self):
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, "r") as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"❌ Error loading parse cache index: {e}")
+        return {"parser_version": None, "files": {}}
+
+    def save(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    def clear(self):
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".pkl"):
+                os.remove(os.path.join(self.cache_dir, name))
+        self.index = {"parser_version": self.parser_version, "files": {}}
+        self.save()
+
+    def entry_path(self, sha256):
+        return os.path.join(self.cache_dir, f"{sha256}.pkl")
+
+    def get(self, file_name, sha256):
+        """Return the cached DataFrame for this file content, or None on a miss"""
+        if self.index["files"].get(file_name) != sha256:
+            return None
+        try:
+            return pd.read_pickle(self.entry_path(sha256))
+        except Exception:
+            return None
+
+    def put(self, file_name, sha256, df):
+        previous = self.index["files"].get(file_name)
+        try:
+            df.to_pickle(self.entry_path(sha256))
+        except Exception as e:
+            print(f"❌ Error writing parse cache entry for {file_name}: {e}")
+            return
+        self.index["files"][file_name] = sha256
+        if previous and previous != sha256:
+            self.discard(previous)
+
+    def evict_missing(self, file_names):
+        """Drop entries for workbooks that no longer exist in the Excel directory"""
+        removed = [name for name in self.index["files"] if name not in file_names]
+        for name in removed:
+            sha256 = self.index["files"].pop(name)
+            self.discard(sha256)
+        return removed
+
+    def discard(self, sha256):
+        # Identical copies of a workbook share one entry
+        if sha256 in self.index["files"].values():
+            return
+        path = self.entry_path(sha256)
+        if os.path.exists(path):
+            os.remove(path)
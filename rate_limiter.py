@@ -0,0 +1,48 @@
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+class HostRateLimiter:
+    """
+    Polite per-host limiter: a token bucket (rate requests/second, up to burst
+    back-to-back) plus a cap on requests in flight to the same host
+    """
+
+    def __init__(self, rate=0.5, burst=1, max_in_flight=2):
+        self.rate = rate
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self._lock = threading.Lock()
+        self._hosts = {}
+
+    def _host_state(self, host):
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = {
+                    'tokens': float(self.burst),
+                    'updated': time.monotonic(),
+                    'lock': threading.Lock(),
+                    'slots': threading.BoundedSemaphore(self.max_in_flight)
+                }
+            return self._hosts[host]
+
+    def _take_token(self, state):
+        while True:
+            with state['lock']:
+                now = time.monotonic()
+                state['tokens'] = min(self.burst, state['tokens'] + (now - state['updated']) * self.rate)
+                state['updated'] = now
+                if state['tokens'] >= 1:
+                    state['tokens'] -= 1
+                    return
+                wait = (1 - state['tokens']) / self.rate
+            time.sleep(wait)
+
+    @contextmanager
+    def request(self, url):
+        """Block until a request to url's host is allowed; hold an in-flight slot while it runs"""
+        state = self._host_state(urlparse(url).netloc)
+        with state['slots']:
+            self._take_token(state)
+            yield
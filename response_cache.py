@@ -0,0 +1,115 @@
+import threading
+import logging
+from collections import OrderedDict
+from functools import wraps
+from flask import request, Response
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+class ResponseCache:
+    """
+    LRU cache of rendered API responses keyed by endpoint, normalised query
+    args and the version of the tracked dataset, bounded by entry count and
+    total body size. invalidate() swaps in an empty cache in one step whenever
+    new data is installed
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._generation = 0
+        self._store = None
+        self.counters = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+    def track(self, store):
+        """
+        Key responses by the version of store's current snapshot (a DatasetStore),
+        so a response built from one snapshot is never served for another
+        """
+        self._store = store
+
+    def current_version(self):
+        snapshot = self._store.current if self._store else None
+        return snapshot.version if snapshot is not None else None
+
+    @staticmethod
+    def make_key(endpoint, params, args, version=None):
+        """Only the endpoint's own params count, in a fixed order and with defaults filled in"""
+        return (endpoint, version) + tuple(
+            (name, args.get(name, default)) for name, default in sorted(params.items())
+        )
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.counters['misses'] += 1
+                return None, self._generation
+            self._entries.move_to_end(key)
+            self.counters['hits'] += 1
+            return entry, self._generation
+
+    def put(self, key, entry, generation):
+        body = entry[0]
+        with self._lock:
+            # Computed from data that has since been replaced
+            if generation != self._generation or len(body) > self.max_bytes:
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[0])
+            self._entries[key] = entry
+            self._bytes += len(body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted[0])
+                self.counters['evictions'] += 1
+
+    def invalidate(self):
+        """Drop every cached response"""
+        with self._lock:
+            self._entries = OrderedDict()
+            self._bytes = 0
+            self._generation += 1
+            self.counters['invalidations'] += 1
+        logger.info("Response cache invalidated")
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._bytes
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        return stats
+
+    def cached(self, **params):
+        """
+        Decorator for a Flask view whose response depends only on params
+        (query arg name -> default). Successful responses are cached
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                version = self.current_version()
+                key = self.make_key(view.__name__, params, request.args, version)
+                entry, generation = self.get(key)
+                if entry is not None:
+                    body, mimetype = entry
+                    return Response(body, mimetype=mimetype)
+
+                response = view(*args, **kwargs)
+                # Not cached if a new snapshot was published while the view ran
+                if isinstance(response, Response) and response.status_code == 200 and self.current_version() == version:
+                    self.put(key, (response.get_data(), response.mimetype), generation)
+                return response
+            return wrapper
+        return decorator
+
+response_cache = ResponseCache()
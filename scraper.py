@@ -1,26 +1,64 @@
 import requests
 from bs4 import BeautifulSoup
+import lxml.html
 import re
+import json
+import hashlib
 from datetime import datetime
 import logging
+from sqlalchemy import func, or_
 from src.models.db import db
 from src.models.bank import Bank
 from src.models.monthly_statistic import MonthlyStatistic
-import time
+from src.models.ingest_manifest import IngestManifest
+from src.models.metric_growth import MetricGrowth
+from src.utils.rate_limiter import HostRateLimiter
+from src.utils.http_cache import HTTPCache, DEFAULT_MAX_BYTES, create_session
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://www.rbi.org.in/Scripts/ATMView.aspx"
 
-def get_available_months():
+# Statistic columns, in the order they appear from the third cell of a data row
+STAT_FIELDS = [
+    'atm_onsite', 'atm_offsite', 'pos_terminals', 'micro_atms', 'bharat_qr_codes',
+    'upi_qr_codes', 'credit_cards', 'debit_cards', 'pos_txn_volume', 'pos_txn_value',
+    'online_txn_volume', 'online_txn_value'
+]
+FLOAT_FIELDS = {'pos_txn_value', 'online_txn_value'}
+
+# Defaults for concurrent fetching; override via SCRAPER_* keys in app.config
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_RATE_LIMIT = 0.5  # requests per second per host
+DEFAULT_MAX_IN_FLIGHT = 2  # concurrent requests per host
+
+# Shared limiter for callers that don't pass their own (one request every 2s)
+default_limiter = HostRateLimiter(rate=DEFAULT_RATE_LIMIT, burst=1, max_in_flight=1)
+
+def fetch_page(url, session=None, limiter=None, cache=None, conditional=True, defer_store=False):
+    """
+    GET url through the per-host rate limiter and return the response.
+    With an HTTPCache the request is conditional; check response.not_modified.
+    With defer_store the caller must cache.commit(url) once the page is processed
+    """
+    limiter = limiter or default_limiter
+    with limiter.request(url):
+        if cache:
+            response = cache.get(url, session, conditional=conditional, defer_store=defer_store)
+        else:
+            response = (session or requests).get(url, timeout=30)
+    response.raise_for_status()
+    return response
+
+def get_available_months(session=None, limiter=None, cache=None):
     """
     Fetch the list of available months from the RBI website
     Returns a list of tuples (month_name, month_url, is_revised)
     """
     try:
         logger.info(f"Fetching available months from {BASE_URL}")
-        response = requests.get(BASE_URL, timeout=30)
-        response.raise_for_status()
+        response = fetch_page(BASE_URL, session, limiter, cache)
         
         soup = BeautifulSoup(response.text, 'html.parser')
         months = []
@@ -48,94 +86,105 @@ def get_available_months():
         logger.error(f"Error fetching available months: {str(e)}")
         return []
 
-def parse_month_data(month_url):
+def get_month_url(month_url):
+    """Absolute URL for a month link from the listing page"""
+    # Fix URL joining - ensure proper slash between domain and path
+    if not month_url.startswith('http'):
+        if month_url.startswith('/'):
+            return f"https://www.rbi.org.in{month_url}"
+        return f"https://www.rbi.org.in/Scripts/{month_url}"
+    return month_url
+
+def parse_month_data(month_url, session=None, limiter=None, cache=None, skip_unchanged=True):
     """
     Parse the data for a specific month
-    Returns a tuple of (month_date, bank_data_list)
+    Returns a tuple of (month_date, bank_data_list), or (None, None) when
+    skip_unchanged is set and the page is unchanged since it was last cached (HTTP 304).
+    A fetched page is only cached once the caller calls cache.commit() for it
     """
     try:
-        # Fix URL joining - ensure proper slash between domain and path
-        if not month_url.startswith('http'):
-            if month_url.startswith('/'):
-                full_url = f"https://www.rbi.org.in{month_url}"
-            else:
-                full_url = f"https://www.rbi.org.in/Scripts/{month_url}"
-        else:
-            full_url = month_url
-            
+        full_url = get_month_url(month_url)
         logger.info(f"Parsing data from {full_url}")
         
-        # Add delay to avoid overwhelming the server
-        time.sleep(2)
-        
-        response = requests.get(full_url, timeout=30)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
+        # The limiter spaces requests to avoid overwhelming the server
+        response = fetch_page(full_url, session, limiter, cache, conditional=skip_unchanged, defer_store=True)
+        if getattr(response, 'not_modified', False):
+            logger.info(f"Page unchanged since last fetch: {full_url}")
+            return None, None
+        return parse_month_html(response.text, month_url, full_url)
+    
+    except Exception as e:
+        logger.error(f"Error parsing month data: {str(e)}")
+        return None, []
+
+def extract_month_date(page_title, month_url):
+    """Month of a statistics page, from its title, else its atmid, else the current month"""
+    month_date = None
+    
+    # Try to extract from title first
+    if page_title:
+        title_match = re.search(r'(\w+)\s+(\d{4})', page_title)
+        if title_match:
+            month_str = title_match.group(1)
+            year_str = title_match.group(2)
+            try:
+                month_date = datetime.strptime(f"01 {month_str} {year_str}", "%d %B %Y").date()
+                logger.info(f"Extracted month date from title: {month_date}")
+            except ValueError:
+                logger.warning(f"Could not parse date from title: {month_str} {year_str}")
+    
+    # If not found in title, try to extract from URL
+    if not month_date and month_url:
+        # Extract month ID from URL
+        atmid_match = re.search(r'atmid=(\d+)', month_url)
+        if atmid_match:
+            atmid = atmid_match.group(1)
+            logger.info(f"Extracted atmid: {atmid}")
+            
+            # Map recent atmids to known months (hardcoded fallback)
+            atmid_to_month = {
+                '169': (3, 2025),  # March 2025
+                '168': (2, 2025),  # February 2025
+                '167': (1, 2025),  # January 2025
+                '166': (12, 2024), # December 2024
+                '165': (11, 2024), # November 2024
+                '164': (10, 2024), # October 2024
+                '163': (9, 2024),  # September 2024
+                '162': (8, 2024),  # August 2024
+                '161': (7, 2024),  # July 2024
+                '160': (6, 2024),  # June 2024
+            }
+            
+            if atmid in atmid_to_month:
+                month_num, year = atmid_to_month[atmid]
+                month_date = datetime(year, month_num, 1).date()
+                logger.info(f"Mapped atmid {atmid} to date: {month_date}")
+    
+    # If still no date, use current month as fallback
+    if not month_date:
+        logger.warning("Could not extract month date, using current month as fallback")
+        current_date = datetime.now()
+        month_date = datetime(current_date.year, current_date.month, 1).date()
+    
+    return month_date
+
+def parse_month_html(html, month_url, full_url):
+    """
+    Extract (month_date, bank_data_list) from a month's statistics page
+    Uses lxml and goes straight to the data table's row/cell text
+    """
+    try:
+        doc = lxml.html.fromstring(html)
         
         # Log the title for debugging
-        page_title = soup.title.string if soup.title else "No title found"
-        logger.info(f"Page title: {page_title}")
-        
-        # Extract month and year from page title or URL
-        month_date = None
-        
-        # Try to extract from title first
-        if soup.title and soup.title.string:
-            title_match = re.search(r'(\w+)\s+(\d{4})', soup.title.string)
-            if title_match:
-                month_str = title_match.group(1)
-                year_str = title_match.group(2)
-                try:
-                    month_date = datetime.strptime(f"01 {month_str} {year_str}", "%d %B %Y").date()
-                    logger.info(f"Extracted month date from title: {month_date}")
-                except ValueError:
-                    logger.warning(f"Could not parse date from title: {month_str} {year_str}")
-        
-        # If not found in title, try to extract from URL
-        if not month_date and month_url:
-            # Extract month ID from URL
-            atmid_match = re.search(r'atmid=(\d+)', month_url)
-            if atmid_match:
-                atmid = atmid_match.group(1)
-                logger.info(f"Extracted atmid: {atmid}")
-                
-                # Map recent atmids to known months (hardcoded fallback)
-                atmid_to_month = {
-                    '169': (3, 2025),  # March 2025
-                    '168': (2, 2025),  # February 2025
-                    '167': (1, 2025),  # January 2025
-                    '166': (12, 2024), # December 2024
-                    '165': (11, 2024), # November 2024
-                    '164': (10, 2024), # October 2024
-                    '163': (9, 2024),  # September 2024
-                    '162': (8, 2024),  # August 2024
-                    '161': (7, 2024),  # July 2024
-                    '160': (6, 2024),  # June 2024
-                }
-                
-                if atmid in atmid_to_month:
-                    month_num, year = atmid_to_month[atmid]
-                    month_date = datetime(year, month_num, 1).date()
-                    logger.info(f"Mapped atmid {atmid} to date: {month_date}")
-        
-        # If still no date, use current month as fallback
-        if not month_date:
-            logger.warning("Could not extract month date, using current month as fallback")
-            current_date = datetime.now()
-            month_date = datetime(current_date.year, current_date.month, 1).date()
-        
-        # Find the main data table
-        tables = soup.find_all('table')
-        main_table = None
+        page_title = doc.findtext('.//title')
+        logger.info(f"Page title: {page_title if page_title is not None else 'No title found'}")
         
-        # Look for the table with the right structure
-        for table in tables:
-            if table.find('tr') and len(table.find_all('tr')) > 5:  # Assuming data table has many rows
-                main_table = table
-                break
+        month_date = extract_month_date(page_title, month_url)
         
-        if not main_table:
+        # The data table is the first table with more than five rows
+        tables = doc.xpath('(//table[count(.//tr) > 5])[1]')
+        if not tables:
             logger.error(f"Could not find data table in {full_url}")
             return month_date, []
         
@@ -143,77 +192,39 @@ def parse_month_data(month_url):
         bank_data = []
         bank_type = None
         
-        for row in main_table.find_all('tr')[3:]:  # Skip header rows
-            cells = row.find_all('td')
+        for row in tables[0].xpath('.//tr')[3:]:  # Skip header rows
+            cells = [cell.text_content().strip() for cell in row.xpath('.//td')]
             
             # Skip rows with insufficient data
             if len(cells) < 5:
                 continue
             
             # Check if this is a bank type header row
-            if len(cells) == 1 or (len(cells) > 1 and not cells[0].get_text().strip().isdigit()):
-                bank_type_text = cells[0].get_text().strip()
-                if bank_type_text and not bank_type_text.isdigit():
-                    bank_type = bank_type_text
+            if not cells[0].isdigit():
+                if cells[0]:
+                    bank_type = cells[0]
                     logger.info(f"Found bank type: {bank_type}")
                 continue
             
+            # Skip rows without a bank name
+            bank_name = cells[1]
+            if not bank_name:
+                continue
+            
             try:
-                # Extract bank data
-                bank_name = cells[1].get_text().strip() if len(cells) > 1 else ""
-                
-                # Skip rows without a bank name
-                if not bank_name:
-                    continue
-                
-                # Create data dictionary with default values
-                data = {
-                    'bank_type': bank_type,
-                    'bank_name': bank_name,
-                    'atm_onsite': 0,
-                    'atm_offsite': 0,
-                    'pos_terminals': 0,
-                    'micro_atms': 0,
-                    'bharat_qr_codes': 0,
-                    'upi_qr_codes': 0,
-                    'credit_cards': 0,
-                    'debit_cards': 0,
-                    'pos_txn_volume': 0,
-                    'pos_txn_value': 0,
-                    'online_txn_volume': 0,
-                    'online_txn_value': 0
-                }
-                
-                # Extract values safely
-                if len(cells) > 2:
-                    data['atm_onsite'] = parse_int(cells[2].get_text().strip())
-                if len(cells) > 3:
-                    data['atm_offsite'] = parse_int(cells[3].get_text().strip())
-                if len(cells) > 4:
-                    data['pos_terminals'] = parse_int(cells[4].get_text().strip())
-                if len(cells) > 5:
-                    data['micro_atms'] = parse_int(cells[5].get_text().strip())
-                if len(cells) > 6:
-                    data['bharat_qr_codes'] = parse_int(cells[6].get_text().strip())
-                if len(cells) > 7:
-                    data['upi_qr_codes'] = parse_int(cells[7].get_text().strip())
-                if len(cells) > 8:
-                    data['credit_cards'] = parse_int(cells[8].get_text().strip())
-                if len(cells) > 9:
-                    data['debit_cards'] = parse_int(cells[9].get_text().strip())
-                if len(cells) > 10:
-                    data['pos_txn_volume'] = parse_int(cells[10].get_text().strip())
-                if len(cells) > 11:
-                    data['pos_txn_value'] = parse_float(cells[11].get_text().strip())
-                if len(cells) > 12:
-                    data['online_txn_volume'] = parse_int(cells[12].get_text().strip())
-                if len(cells) > 13:
-                    data['online_txn_value'] = parse_float(cells[13].get_text().strip())
+                data = {'bank_type': bank_type, 'bank_name': bank_name}
+                for i, field in enumerate(STAT_FIELDS, start=2):
+                    if i >= len(cells):
+                        data[field] = 0
+                    elif field in FLOAT_FIELDS:
+                        data[field] = parse_float(cells[i])
+                    else:
+                        data[field] = parse_int(cells[i])
                 
                 bank_data.append(data)
-                logger.info(f"Parsed data for bank: {bank_name}")
+                logger.debug(f"Parsed data for bank: {bank_name}")
             except Exception as e:
-                logger.warning(f"Error parsing row data for {bank_name if 'bank_name' in locals() else 'unknown bank'}: {str(e)}")
+                logger.warning(f"Error parsing row data for {bank_name}: {str(e)}")
                 continue
         
         logger.info(f"Parsed {len(bank_data)} bank records for {month_date}")
@@ -245,75 +256,149 @@ def parse_float(value):
     except (ValueError, TypeError):
         return 0.0
 
-def update_database(month_date, bank_data, is_revised):
+def month_fingerprint(month_date, bank_data):
+    """SHA-256 over a month's parsed rows, used to detect changed pages"""
+    payload = json.dumps([str(month_date), bank_data], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def record_ingest(source_url, month_date, is_revised, fingerprint):
+    """Add or refresh the manifest entry for a month page (caller commits)"""
+    entry = IngestManifest.query.filter_by(source_url=source_url).first()
+    if not entry:
+        entry = IngestManifest(source_url=source_url)
+        db.session.add(entry)
+    entry.month = month_date
+    entry.is_revised = is_revised
+    entry.fingerprint = fingerprint
+    entry.ingested_at = datetime.utcnow()
+
+def refresh_growth(bank_ids=None, month=None):
+    """
+    Rebuild the precomputed month-on-month growth of every metric for the
+    given banks (all banks when None), pairing each statistics row with the
+    bank's previous one through a LAG window. With month only the pairs that
+    involve it are rebuilt: its row against the previous one, and the bank's
+    next row against it. Caller commits
+    """
+    def lag(column):
+        return func.lag(column, type_=column.type).over(
+            partition_by=MonthlyStatistic.bank_id,
+            order_by=(MonthlyStatistic.month, MonthlyStatistic.stat_id)
+        )
+    
+    pairs = db.session.query(
+        MonthlyStatistic.bank_id,
+        MonthlyStatistic.month,
+        lag(MonthlyStatistic.month).label('previous_month'),
+        *[getattr(MonthlyStatistic, field).label(field) for field in STAT_FIELDS],
+        *[lag(getattr(MonthlyStatistic, field)).label('previous_' + field) for field in STAT_FIELDS]
+    )
+    stale = MetricGrowth.query
+    if bank_ids is not None:
+        pairs = pairs.filter(MonthlyStatistic.bank_id.in_(bank_ids))
+        stale = stale.filter(MetricGrowth.bank_id.in_(bank_ids))
+    pairs = pairs.subquery()
+    
+    changed = db.session.query(pairs).filter(pairs.c.previous_month.isnot(None))
+    if month is not None:
+        changed = changed.filter(or_(pairs.c.month == month, pairs.c.previous_month == month))
+        # Pairs spanning month, including one it now splits in two
+        stale = stale.filter(MetricGrowth.previous_month <= month, MetricGrowth.month >= month)
+    stale.delete(synchronize_session=False)
+    
+    rows = []
+    for pair in changed:
+        for field in STAT_FIELDS:
+            value = float(getattr(pair, field) or 0)
+            previous_value = float(getattr(pair, 'previous_' + field) or 0)
+            growth_pct = 0.0
+            if previous_value > 0:
+                growth_pct = (value - previous_value) / previous_value * 100
+            rows.append({
+                'bank_id': pair.bank_id,
+                'metric': field,
+                'month': pair.month,
+                'previous_month': pair.previous_month,
+                'value': value,
+                'previous_value': previous_value,
+                'growth_percentage': round(growth_pct, 2)
+            })
+    
+    if rows:
+        db.session.bulk_insert_mappings(MetricGrowth, rows)
+    return len(rows)
+
+def update_database(month_date, bank_data, is_revised, source_url=None, fingerprint=None):
     """
     Update the database with the parsed data
+    Loads the bank directory and the month's existing statistics once, diffs in
+    memory and applies inserts/updates as bulk mappings in one transaction.
+    When source_url is given the ingest manifest is updated in the same transaction
     """
     try:
         logger.info(f"Updating database with {len(bank_data)} records for {month_date}")
         
-        # Process each bank
+        # Keep the first row seen for each bank
+        rows_by_bank = {}
         for data in bank_data:
-            # Find or create bank
-            bank = Bank.query.filter_by(bank_name=data['bank_name']).first()
-            if not bank:
-                bank = Bank(
-                    bank_name=data['bank_name'],
-                    bank_type=data['bank_type'] or "Unknown"
-                )
-                db.session.add(bank)
-                db.session.flush()  # Get the bank_id without committing
-                logger.info(f"Created new bank: {data['bank_name']}")
-            
-            # Find existing statistic for this bank and month
-            stat = MonthlyStatistic.query.filter_by(
-                bank_id=bank.bank_id,
-                month=month_date
-            ).first()
-            
-            # If statistic exists and is not revised, or if it's a new entry
-            if not stat or (is_revised and not stat.is_revised):
-                if stat:
-                    # Update existing record if it's being revised
-                    logger.info(f"Updating existing record for {data['bank_name']} ({month_date})")
-                    stat.is_revised = True
-                    stat.atm_onsite = data['atm_onsite']
-                    stat.atm_offsite = data['atm_offsite']
-                    stat.pos_terminals = data['pos_terminals']
-                    stat.micro_atms = data['micro_atms']
-                    stat.bharat_qr_codes = data['bharat_qr_codes']
-                    stat.upi_qr_codes = data['upi_qr_codes']
-                    stat.credit_cards = data['credit_cards']
-                    stat.debit_cards = data['debit_cards']
-                    stat.pos_txn_volume = data['pos_txn_volume']
-                    stat.pos_txn_value = data['pos_txn_value']
-                    stat.online_txn_volume = data['online_txn_volume']
-                    stat.online_txn_value = data['online_txn_value']
-                else:
-                    # Create new record
-                    logger.info(f"Creating new record for {data['bank_name']} ({month_date})")
-                    stat = MonthlyStatistic(
-                        bank_id=bank.bank_id,
-                        month=month_date,
-                        is_revised=is_revised,
-                        atm_onsite=data['atm_onsite'],
-                        atm_offsite=data['atm_offsite'],
-                        pos_terminals=data['pos_terminals'],
-                        micro_atms=data['micro_atms'],
-                        bharat_qr_codes=data['bharat_qr_codes'],
-                        upi_qr_codes=data['upi_qr_codes'],
-                        credit_cards=data['credit_cards'],
-                        debit_cards=data['debit_cards'],
-                        pos_txn_volume=data['pos_txn_volume'],
-                        pos_txn_value=data['pos_txn_value'],
-                        online_txn_volume=data['online_txn_volume'],
-                        online_txn_value=data['online_txn_value']
-                    )
-                    db.session.add(stat)
+            rows_by_bank.setdefault(data['bank_name'], data)
+        
+        # Bank directory: name -> id (lowest id wins for duplicate names)
+        bank_ids = {}
+        for bank_name, bank_id in db.session.query(Bank.bank_name, Bank.bank_id).order_by(Bank.bank_id):
+            bank_ids.setdefault(bank_name, bank_id)
+        
+        # Create missing banks in one batch
+        new_banks = [
+            {'bank_name': bank_name, 'bank_type': data['bank_type'] or "Unknown"}
+            for bank_name, data in rows_by_bank.items()
+            if bank_name not in bank_ids
+        ]
+        if new_banks:
+            db.session.bulk_insert_mappings(Bank, new_banks, return_defaults=True)
+            for bank in new_banks:
+                bank_ids[bank['bank_name']] = bank['bank_id']
+            logger.info(f"Created {len(new_banks)} new banks")
+        
+        # Existing statistics for this month: bank_id -> (stat_id, is_revised)
+        existing = {}
+        stats_query = db.session.query(
+            MonthlyStatistic.bank_id, MonthlyStatistic.stat_id, MonthlyStatistic.is_revised
+        ).filter(MonthlyStatistic.month == month_date).order_by(MonthlyStatistic.stat_id)
+        for bank_id, stat_id, stat_revised in stats_query:
+            existing.setdefault(bank_id, (stat_id, stat_revised))
+        
+        # Diff: insert new entries, update existing ones only when this is a revision
+        inserts = []
+        updates = []
+        changed_banks = set()
+        for bank_name, data in rows_by_bank.items():
+            bank_id = bank_ids[bank_name]
+            values = {field: data[field] for field in STAT_FIELDS}
+            if bank_id not in existing:
+                values.update(bank_id=bank_id, month=month_date, is_revised=is_revised)
+                inserts.append(values)
+                changed_banks.add(bank_id)
+            elif is_revised and not existing[bank_id][1]:
+                values.update(stat_id=existing[bank_id][0], is_revised=True)
+                updates.append(values)
+                changed_banks.add(bank_id)
+        
+        if inserts:
+            db.session.bulk_insert_mappings(MonthlyStatistic, inserts)
+        if updates:
+            db.session.bulk_update_mappings(MonthlyStatistic, updates)
+        
+        # New or revised rows change their banks' growth around this month
+        if changed_banks:
+            refresh_growth(changed_banks, month_date)
+        
+        if source_url:
+            record_ingest(source_url, month_date, is_revised, fingerprint or month_fingerprint(month_date, bank_data))
         
         # Commit all changes
         db.session.commit()
-        logger.info(f"Successfully updated database for {month_date}")
+        logger.info(f"Successfully updated database for {month_date}: {len(inserts)} created, {len(updates)} revised")
         return True
     
     except Exception as e:
@@ -325,37 +410,91 @@ def check_for_updates(app):
     """
     Check for new data and update the database
     This function is called by the scheduler
+    Month pages are fetched and parsed concurrently by a thread pool while the
+    calling thread writes finished months to the database
     """
     with app.app_context():
         try:
             logger.info("Starting RBI data update process")
             
-            # Get available months
-            months = get_available_months()
-            if not months:
-                logger.warning("No months found on RBI website")
-                return
-            
-            logger.info(f"Found {len(months)} months on RBI website")
+            # Databases from before growth was precomputed get it backfilled once
+            if db.session.query(MetricGrowth.growth_id).first() is None and db.session.query(MonthlyStatistic.stat_id).first() is not None:
+                logger.info(f"Backfilled {refresh_growth()} growth entries")
+                db.session.commit()
             
-            # Process each month
-            for month_name, month_url, is_revised in months:
-                logger.info(f"Processing {month_name} (Revised: {is_revised})")
+            max_workers = app.config.get('SCRAPER_MAX_WORKERS', DEFAULT_MAX_WORKERS)
+            limiter = HostRateLimiter(
+                rate=app.config.get('SCRAPER_RATE_LIMIT', DEFAULT_RATE_LIMIT),
+                burst=app.config.get('SCRAPER_RATE_BURST', 1),
+                max_in_flight=app.config.get('SCRAPER_MAX_IN_FLIGHT', DEFAULT_MAX_IN_FLIGHT)
+            )
+            # Closed on every exit path, including errors while fetching
+            with create_session(max_workers) as session:
+                cache = HTTPCache(
+                    app.config.get('HTTP_CACHE_DIR', 'http_cache'),
+                    app.config.get('HTTP_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)
+                )
+                
+                # Get available months
+                months = get_available_months(session, limiter, cache)
+                if not months:
+                    logger.warning("No months found on RBI website")
+                    return
+                
+                logger.info(f"Found {len(months)} months on RBI website")
                 
-                # Parse month data
-                month_date, bank_data = parse_month_data(month_url)
-                if not month_date or not bank_data:
-                    logger.warning(f"No data found for {month_name}")
-                    continue
+                # Manifest of pages already ingested: source_url -> (fingerprint, is_revised)
+                manifest = {
+                    source_url: (fingerprint, revised)
+                    for source_url, fingerprint, revised in db.session.query(
+                        IngestManifest.source_url, IngestManifest.fingerprint, IngestManifest.is_revised
+                    )
+                }
                 
-                # Update database
-                success = update_database(month_date, bank_data, is_revised)
-                if success:
-                    logger.info(f"Successfully updated data for {month_name}")
-                else:
-                    logger.error(f"Failed to update data for {month_name}")
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = {}
+                    for month_name, month_url, is_revised in months:
+                        entry = manifest.get(month_url)
+                        # New or newly revised pages are always parsed; known ones only if they changed
+                        known = entry is not None and (entry[1] or not is_revised)
+                        future = executor.submit(parse_month_data, month_url, session, limiter, cache, known)
+                        futures[future] = (month_name, month_url, is_revised, entry if known else None)
+                
+                    # Write each month as soon as its page is parsed
+                    for future in as_completed(futures):
+                        month_name, month_url, is_revised, entry = futures[future]
+                        logger.info(f"Processing {month_name} (Revised: {is_revised})")
+                        
+                        month_date, bank_data = future.result()
+                        page_url = get_month_url(month_url)
+                        if bank_data is None:
+                            logger.info(f"{month_name} unchanged, skipping")
+                            continue
+                        if not month_date or not bank_data:
+                            # Keep the page uncached so the next run parses it again
+                            cache.discard(page_url)
+                            logger.warning(f"No data found for {month_name}")
+                            continue
+                        
+                        fingerprint = month_fingerprint(month_date, bank_data)
+                        if entry and entry[0] == fingerprint:
+                            cache.commit(page_url)
+                            logger.info(f"{month_name} already ingested with identical data, skipping")
+                            continue
+                        
+                        # Update database and manifest together
+                        success = update_database(month_date, bank_data, is_revised, month_url, fingerprint)
+                        if success:
+                            # Only now may later runs skip this page on a 304
+                            cache.commit(page_url)
+                            logger.info(f"Successfully updated data for {month_name}")
+                        else:
+                            # Make sure the next run parses this page again
+                            cache.discard(page_url)
+                            cache.invalidate(page_url)
+                            logger.error(f"Failed to update data for {month_name}")
             
-            logger.info("RBI data update process completed")
+            logger.info(f"RBI data update process completed (HTTP cache: {cache.stats()})")
         
         except Exception as e:
             logger.error(f"Error in RBI data update process: {str(e)}")
@@ -0,0 +1,144 @@
+import os
+import json
+import time
+import shutil
+import logging
+from contextlib import contextmanager
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+except ImportError:
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of the CURRENT pointer for a newer snapshot
+DEFAULT_CHECK_INTERVAL = 5.0
+
+def arrow_table(df):
+    """
+    df as an Arrow table with NaN kept as NaN in float columns. Arrow nulls
+    would make every worker's to_pandas() copy the column to fill them back in
+    """
+    df = df.reset_index(drop=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for i, field in enumerate(table.schema):
+        column = df[field.name]
+        if isinstance(column.dtype, np.dtype) and column.dtype.kind == 'f' and table.column(i).null_count:
+            table = table.set_column(i, field, pa.array(column.to_numpy(), type=field.type))
+    return table
+
+class SharedSnapshot:
+    """
+    Dataset snapshot shared by every worker process through memory-mapped
+    Arrow IPC files. Each version lives in its own v<N>/ directory; CURRENT
+    names the live one and is replaced atomically, so workers either see the
+    old or the new version, never a partial write. Mapped numeric columns are
+    read-only views of the page cache, so N workers hold one copy
+    """
+
+    def __init__(self, snapshot_dir, check_interval=DEFAULT_CHECK_INTERVAL, keep_versions=2):
+        if pa is None:
+            raise RuntimeError("pyarrow is required for the shared snapshot")
+        self.snapshot_dir = snapshot_dir
+        self.check_interval = check_interval
+        self.keep_versions = keep_versions
+        self.current_path = os.path.join(snapshot_dir, "CURRENT")
+        self.lock_path = os.path.join(snapshot_dir, "publish.lock")
+        self._checked_at = 0.0
+        os.makedirs(snapshot_dir, exist_ok=True)
+
+    @contextmanager
+    def writer_lock(self):
+        """Cross-process lock held by the one worker loading or publishing"""
+        # POSIX only; imported here so the module still imports elsewhere
+        import fcntl
+        with open(self.lock_path, 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def read_pointer(self):
+        """Contents of CURRENT ({'version', 'frames', 'meta'}), or None"""
+        try:
+            with open(self.current_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def latest_version(self):
+        pointer = self.read_pointer()
+        return pointer['version'] if pointer else None
+
+    def newer_version_due(self, version):
+        """Rate-limited check for a snapshot newer than version"""
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return False
+        self._checked_at = now
+        latest = self.latest_version()
+        return latest is not None and latest != version
+
+    def _version_dir(self, version):
+        return os.path.join(self.snapshot_dir, f"v{version}")
+
+    def publish(self, frames, meta=None):
+        """
+        Write frames as a new version and point CURRENT at it.
+        Call with writer_lock held. Returns the new version number
+        """
+        pointer = self.read_pointer()
+        version = (pointer['version'] if pointer else 0) + 1
+        version_dir = self._version_dir(version)
+        shutil.rmtree(version_dir, ignore_errors=True)
+        os.makedirs(version_dir)
+
+        for name, df in frames.items():
+            table = arrow_table(df)
+            path = os.path.join(version_dir, name + ".arrow")
+            with ipc.new_file(path, table.schema) as writer:
+                writer.write_table(table)
+            with open(path, 'rb') as f:
+                os.fsync(f.fileno())
+
+        tmp_path = self.current_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': version, 'frames': sorted(frames), 'meta': meta or {}}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.current_path)
+        logger.info(f"Published shared snapshot version {version}")
+
+        self._remove_old_versions(version)
+        return version
+
+    def _remove_old_versions(self, version):
+        # Unlinked files stay readable for workers that still map them
+        for name in os.listdir(self.snapshot_dir):
+            if name.startswith("v") and name[1:].isdigit() and int(name[1:]) <= version - self.keep_versions:
+                shutil.rmtree(os.path.join(self.snapshot_dir, name), ignore_errors=True)
+
+    def load(self):
+        """
+        Map the current version read-only. Returns (version, frames, meta),
+        or None when nothing has been published yet
+        """
+        for attempt in range(3):
+            pointer = self.read_pointer()
+            if pointer is None:
+                return None
+            version_dir = self._version_dir(pointer['version'])
+            try:
+                frames = {}
+                for name in pointer['frames']:
+                    source = pa.memory_map(os.path.join(version_dir, name + ".arrow"))
+                    frames[name] = ipc.open_file(source).read_all().to_pandas(split_blocks=True)
+                return pointer['version'], frames, pointer.get('meta', {})
+            except FileNotFoundError:
+                # Superseded and cleaned up between reading CURRENT and mapping
+                continue
+        raise RuntimeError("shared snapshot kept changing while loading")
@@ -0,0 +1,187 @@
+import logging
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# monthly_stats metric columns, in table order
+METRIC_COLUMNS = [
+    'credit_cards', 'debit_cards', 'atm_onsite', 'atm_offsite', 'pos_terminals',
+    'micro_atms', 'bharat_qr_codes', 'upi_qr_codes', 'pos_txn_volume',
+    'pos_txn_value', 'online_txn_volume', 'online_txn_value'
+]
+
+REAL_COLUMNS = {'pos_txn_value', 'online_txn_value'}
+
+UPSERT_STATS_SQL = """
+INSERT INTO monthly_stats (bank_id, month, month_str, {columns})
+VALUES (?, ?, ?, {placeholders})
+ON CONFLICT(bank_id, month) DO UPDATE SET
+    month_str = excluded.month_str,
+    {updates}
+""".format(
+    columns=', '.join(METRIC_COLUMNS),
+    placeholders=', '.join('?' for _ in METRIC_COLUMNS),
+    updates=',\n    '.join(f"{col} = excluded.{col}" for col in METRIC_COLUMNS)
+)
+
+# Per-month totals by bank type, kept in step with monthly_stats on every ingest
+CREATE_ROLLUP_SQL = """
+CREATE TABLE IF NOT EXISTS monthly_rollup (
+    month TEXT NOT NULL,
+    month_str TEXT NOT NULL,
+    bank_type TEXT NOT NULL,
+    bank_count INTEGER NOT NULL DEFAULT 0,
+    {columns},
+    PRIMARY KEY (month, bank_type)
+)
+""".format(columns=',\n    '.join(
+    f"{col} {'REAL' if col in REAL_COLUMNS else 'INTEGER'} NOT NULL DEFAULT 0" for col in METRIC_COLUMNS
+))
+
+REBUILD_ROLLUP_SQL = """
+INSERT INTO monthly_rollup (month, month_str, bank_type, bank_count, {columns})
+SELECT ms.month, MAX(ms.month_str), b.bank_type, COUNT(*), {sums}
+FROM monthly_stats ms
+JOIN banks b ON ms.bank_id = b.id
+{where}
+GROUP BY ms.month, b.bank_type
+""".format(
+    columns=', '.join(METRIC_COLUMNS),
+    sums=', '.join(f"SUM(ms.{col})" for col in METRIC_COLUMNS),
+    where='{where}'
+)
+
+# Same layout as the IngestManifest model (ingest_manifest.py), so Excel
+# downloads and scraped month pages are recorded in one format
+CREATE_MANIFEST_SQL = """
+CREATE TABLE IF NOT EXISTS ingest_manifest (
+    manifest_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source_url VARCHAR(500) NOT NULL UNIQUE,
+    month DATE NOT NULL,
+    is_revised BOOLEAN DEFAULT 0,
+    fingerprint VARCHAR(64) NOT NULL,
+    ingested_at DATETIME
+)
+"""
+
+RECORD_MANIFEST_SQL = """
+INSERT INTO ingest_manifest (source_url, month, is_revised, fingerprint, ingested_at)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(source_url) DO UPDATE SET
+    month = excluded.month,
+    is_revised = excluded.is_revised,
+    fingerprint = excluded.fingerprint,
+    ingested_at = excluded.ingested_at
+"""
+
+def ensure_manifest(conn):
+    """
+    Create the ingest_manifest table, converting one written in the older
+    source_url/file_name layout. The caller commits
+    """
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA table_info(ingest_manifest)")
+    columns = {row[1] for row in cursor.fetchall()}
+    if columns and 'manifest_id' not in columns:
+        cursor.execute("SELECT source_url, month, is_revised, fingerprint, ingested_at FROM ingest_manifest")
+        rows = cursor.fetchall()
+        cursor.execute("DROP TABLE ingest_manifest")
+        cursor.execute(CREATE_MANIFEST_SQL)
+        # The old layout kept months as "January-2024"
+        cursor.executemany(
+            "INSERT INTO ingest_manifest (source_url, month, is_revised, fingerprint, ingested_at) VALUES (?, ?, ?, ?, ?)",
+            [(source_url, manifest_month(month), is_revised, fingerprint, ingested_at)
+             for source_url, month, is_revised, fingerprint, ingested_at in rows]
+        )
+        logger.info("Converted ingest_manifest to the shared layout")
+    else:
+        cursor.execute(CREATE_MANIFEST_SQL)
+
+def manifest_month(month_str):
+    """YYYY-MM-DD for a "January-2024" style month, or the value unchanged if it is not one"""
+    try:
+        return datetime.strptime(month_str, "%B-%Y").strftime("%Y-%m-%d")
+    except (TypeError, ValueError):
+        return month_str
+
+def load_manifest(cursor):
+    """Map source_url -> (month, fingerprint) for every ingested source"""
+    cursor.execute("SELECT source_url, month, fingerprint FROM ingest_manifest")
+    return {source_url: (month, fingerprint) for source_url, month, fingerprint in cursor.fetchall()}
+
+def record_manifest(conn, entries):
+    """
+    Add or refresh manifest rows from (source_url, month, is_revised, fingerprint)
+    entries, month as YYYY-MM-DD. The caller owns the transaction
+    """
+    now = str(datetime.utcnow())
+    conn.executemany(
+        RECORD_MANIFEST_SQL,
+        [(source_url, month, 1 if is_revised else 0, fingerprint, now)
+         for source_url, month, is_revised, fingerprint in entries]
+    )
+
+def load_bank_ids(cursor):
+    """Map bank_name -> id for every known bank"""
+    cursor.execute("SELECT bank_name, id FROM banks")
+    return dict(cursor.fetchall())
+
+def upsert_stats_batches(conn, batches):
+    """
+    Bulk-write parsed batches (one DataFrame per file) into banks and monthly_stats.
+    Banks are resolved from one preloaded name -> id map, unknown banks are
+    inserted in a single batch, and stats are upserted with executemany.
+    The caller owns the transaction. Returns the number of stats rows written.
+    """
+    cursor = conn.cursor()
+    bank_ids = load_bank_ids(cursor)
+    
+    # Insert unknown banks in one batch
+    new_banks = {}
+    for df in batches:
+        for bank_name, bank_type in zip(df['bank_name'], df['bank_type']):
+            if bank_name not in bank_ids and bank_name not in new_banks:
+                new_banks[bank_name] = bank_type
+    if new_banks:
+        cursor.executemany(
+            "INSERT OR IGNORE INTO banks (bank_name, bank_type) VALUES (?, ?)",
+            list(new_banks.items())
+        )
+        bank_ids = load_bank_ids(cursor)
+        logger.info(f"Added {len(new_banks)} new banks")
+    
+    # Upsert stats column-wise, without building a dict per row. Missing cells
+    # are written as the NOT NULL column default (0), as INSERT OR REPLACE did
+    records = 0
+    for df in batches:
+        columns = [
+            df['bank_name'].map(bank_ids).tolist(),
+            df['month'].dt.strftime("%Y-%m-%d").tolist(),
+            df['month_str'].tolist()
+        ] + [df[col].fillna(0).tolist() for col in METRIC_COLUMNS]
+        cursor.executemany(UPSERT_STATS_SQL, zip(*columns))
+        records += len(df)
+    
+    # Re-aggregate only the months this ingest touched
+    months = {month for df in batches for month in df['month'].dt.strftime("%Y-%m-%d")}
+    refresh_rollup(conn, months)
+    
+    return records
+
+def refresh_rollup(conn, months=None):
+    """
+    Recompute monthly_rollup rows for months (every month when None) from
+    monthly_stats. The caller owns the transaction
+    """
+    cursor = conn.cursor()
+    if months is None:
+        cursor.execute("DELETE FROM monthly_rollup")
+        cursor.execute(REBUILD_ROLLUP_SQL.format(where=""))
+        return
+    
+    months = sorted(months)
+    if not months:
+        return
+    placeholders = ', '.join('?' for _ in months)
+    cursor.execute(f"DELETE FROM monthly_rollup WHERE month IN ({placeholders})", months)
+    cursor.execute(REBUILD_ROLLUP_SQL.format(where=f"WHERE ms.month IN ({placeholders})"), months)
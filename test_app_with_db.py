@@ -0,0 +1,104 @@
+import os
+import sqlite3
+import importlib
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+from excel_parser import RBIExcelParser
+
+@pytest.fixture(scope="module")
+def awd(tmp_path_factory):
+    # The module opens dashboard.log and resolves its paths in the working directory
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("app_with_db"))
+    try:
+        return importlib.import_module("app_with_db")
+    finally:
+        os.chdir(cwd)
+
+@pytest.fixture
+def app_db(awd, tmp_path, monkeypatch):
+    excel_dir = tmp_path / "RBI_ATM_Excel"
+    excel_dir.mkdir()
+    monkeypatch.setattr(awd, "EXCEL_DIR", str(excel_dir))
+    monkeypatch.setattr(awd, "DB_PATH", str(tmp_path / "rbi_card_stats.db"))
+    monkeypatch.setattr(awd, "PARSE_CACHE_DIR", None)
+    awd.init_db()
+    return awd
+
+def write_workbook(excel_dir, file_name, scale=1):
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["Bank Name", "Credit Cards Outstanding", "Debit Cards Outstanding"])
+    ws.append(["-", "-", "-"])
+    ws.append(["-", "-", "-"])
+    for i in range(3):
+        ws.append([f"Bank {i}", (i + 1) * 10 * scale, (i + 1) * 20])
+    wb.save(os.path.join(excel_dir, file_name))
+
+def changed_names(awd):
+    conn = sqlite3.connect(awd.DB_PATH)
+    try:
+        return [f[0] for f in awd.get_changed_excel_files(conn, sorted(os.listdir(awd.EXCEL_DIR)))]
+    finally:
+        conn.close()
+
+def test_changed_files_cover_new_and_edited_files_only(app_db):
+    write_workbook(app_db.EXCEL_DIR, "ATMJANUARY2024.xlsx")
+    write_workbook(app_db.EXCEL_DIR, "ATMFEBRUARY2024.xlsx")
+    assert changed_names(app_db) == ["ATMFEBRUARY2024.xlsx", "ATMJANUARY2024.xlsx"]
+    assert app_db.process_and_store_excel_files()['files_added'] == 2
+    assert changed_names(app_db) == []
+
+    # Touched with the same bytes: not changed
+    path = os.path.join(app_db.EXCEL_DIR, "ATMJANUARY2024.xlsx")
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 60))
+    assert changed_names(app_db) == []
+
+    # New contents: changed
+    write_workbook(app_db.EXCEL_DIR, "ATMFEBRUARY2024.xlsx", scale=2)
+    assert changed_names(app_db) == ["ATMFEBRUARY2024.xlsx"]
+
+def test_unparseable_files_are_recorded_and_not_retried(app_db):
+    write_workbook(app_db.EXCEL_DIR, "ATMJANUARY2024.xlsx")
+    with open(os.path.join(app_db.EXCEL_DIR, "ATMFEBRUARY2024.xlsx"), "wb") as f:
+        f.write(b"not a workbook")
+
+    result = app_db.process_and_store_excel_files()
+    assert result['success'] and result['files_added'] == 1
+    assert list(result['failed_files']) == ["ATMFEBRUARY2024.xlsx"]
+    assert changed_names(app_db) == []
+    assert app_db.process_and_store_excel_files() == {'success': True, 'files_added': 0, 'failed_files': {}}
+
+def test_manifest_entries_flag_revisions_and_record_failed_downloads(awd, tmp_path):
+    parser = RBIExcelParser(str(tmp_path))
+    parser.file_months = {
+        "ATMJANUARY2024.xlsx": pd.Timestamp("2024-01-01"),
+        "ATMFEBRUARY2024.xlsx": pd.Timestamp("2024-02-01"),
+        "ATMMARCH2024.xlsx": pd.Timestamp("2024-03-01"),
+    }
+    files = [
+        ("ATMJANUARY2024.xlsx", 0, 0, "jan-v2"),
+        ("ATMFEBRUARY2024.xlsx", 0, 0, "feb"),
+        ("ATMMARCH2024.xlsx", 0, 0, "mar"),
+        ("ATMAPRIL2024.xlsx", 0, 0, "apr"),
+        ("local.xlsx", 0, 0, "local"),
+    ]
+    sources = {
+        "ATMJANUARY2024.xlsx": "u/jan",
+        "ATMFEBRUARY2024.xlsx": "u/feb-new",
+        "ATMMARCH2024.xlsx": "u/mar",
+        "ATMAPRIL2024.xlsx": "u/apr",
+    }
+    manifest = {
+        "u/jan": ("2024-01-01", "jan-v1"),
+        "u/feb-old": ("2024-02-01", "feb"),
+        "u/mar": ("2024-03-01", "mar"),
+    }
+    assert awd.manifest_entries(parser, files, sources, manifest) == [
+        ("u/jan", "2024-01-01", True, "jan-v2"),       # same URL, new content
+        ("u/feb-new", "2024-02-01", True, "feb"),      # month already taken from another URL
+        ("u/mar", "2024-03-01", False, "mar"),         # unchanged
+        ("u/apr", "2024-04-01", False, "apr"),         # no rows parsed: month from the file name
+    ]
@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+from dashboard_data import average_growth_by_month, compact_frame
+
+MONTHS = ["January-2024", "February-2024", "March-2024", "April-2024"]
+
+def growth_frame():
+    """Two banks' growth rows per month, listed newest month first"""
+    rows = []
+    for i, month_str in reversed(list(enumerate(MONTHS))):
+        month = pd.Timestamp(2024, i + 1, 1)
+        rows.append({'month': month, 'month_str': month_str, 'bank_name': 'A', 'growth': float(i)})
+        rows.append({'month': month, 'month_str': month_str, 'bank_name': 'B', 'growth': float(i) + 2})
+    return pd.DataFrame(rows)
+
+def test_average_growth_by_month_is_chronological():
+    result = average_growth_by_month(growth_frame())
+    assert result['month_str'].tolist() == MONTHS
+    assert result['growth'].tolist() == [1.0, 2.0, 3.0, 4.0]
+
+def test_average_growth_by_month_is_chronological_on_compact_frames():
+    result = average_growth_by_month(compact_frame(growth_frame()))
+    assert result['month_str'].astype(str).tolist() == MONTHS
+
+def test_average_growth_by_month_skips_months_without_growth():
+    df = growth_frame()
+    df.loc[df['month_str'] == "January-2024", 'growth'] = np.nan
+    df.loc[df['month_str'] == "March-2024", 'growth'] = np.inf
+    result = average_growth_by_month(df)
+    assert result['month_str'].tolist() == ["February-2024", "April-2024"]
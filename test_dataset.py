@@ -0,0 +1,52 @@
+import threading
+import time
+import pytest
+from dataset import DatasetStore
+
+def test_get_or_load_runs_one_load_for_concurrent_callers():
+    store = DatasetStore()
+    calls = []
+    start = threading.Barrier(8)
+
+    def load():
+        calls.append(1)
+        time.sleep(0.05)
+        store.publish({'rows': 3})
+
+    results = []
+    def worker():
+        start.wait()
+        results.append(store.get_or_load(load))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(results) == 8
+    assert all(snapshot is results[0] for snapshot in results)
+    assert results[0]['rows'] == 3
+
+def test_get_or_load_skips_load_once_published():
+    store = DatasetStore()
+    store.publish({'rows': 1})
+    store.get_or_load(lambda: pytest.fail("load() ran with a snapshot published"))
+
+def test_failed_load_is_retried_by_the_next_caller():
+    store = DatasetStore()
+    assert store.get_or_load(lambda: None) is None
+    assert store.get_or_load(lambda: store.publish({'rows': 2}))['rows'] == 2
+
+def test_publish_numbers_versions_and_snapshots_are_immutable():
+    store = DatasetStore()
+    first = store.publish({'rows': 1})
+    second = store.publish({'rows': 2})
+    assert (first.version, second.version) == (1, 2)
+    assert store.publish({'rows': 3}, version=7).version == 7
+    assert first['rows'] == 1
+    with pytest.raises(AttributeError):
+        first.version = 5
+    with pytest.raises(TypeError):
+        first._values['rows'] = 5
@@ -0,0 +1,88 @@
+import os
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+from excel_parser import RBIExcelParser, is_supported_workbook
+
+HEADER = [
+    ["Reserve Bank of India", None, None, None],
+    ["Sr. No", "Bank Name", "Credit Cards", "Debit Cards"],
+    ["-", "-", "Outstanding", "Outstanding"],
+    ["-", "-", "(in numbers)", "(in numbers)"],
+]
+
+ROWS = [
+    [1, "State Bank", 1500, 2500],
+    [2, "  Axis Bank ", 700, None],
+    [None, None, None, None],
+    [3, "HDFC Bank", None, 900],
+    ["", "Total", 2200, 3400],
+]
+
+def write_workbook(path, rows=ROWS):
+    wb = Workbook()
+    ws = wb.active
+    for row in HEADER + rows:
+        ws.append(row)
+    wb.save(path)
+
+def legacy_parse_excel(file_path):
+    """The pandas reader parse_excel replaced: three reads and a header fix-up"""
+    preview = pd.read_excel(file_path, header=None, nrows=10)
+    header_row_idx = next(
+        i for i in range(len(preview))
+        if preview.iloc[i].astype(str).str.contains("Bank Name", case=False).any()
+    )
+    header_rows = pd.read_excel(file_path, header=None, skiprows=header_row_idx, nrows=3)
+    combined_header = header_rows.ffill(axis=1).astype(str).apply(lambda x: ' '.join(x).strip().lower(), axis=0)
+    df = pd.read_excel(file_path, header=None, skiprows=header_row_idx + 3)
+    df.columns = combined_header[:len(df.columns)]
+    bank_col = [col for col in df.columns if "bank name" in col][0]
+    credit_col = [col for col in df.columns if "credit card" in col][0]
+    debit_col = [col for col in df.columns if "debit card" in col][0]
+    df = df[[bank_col, credit_col, debit_col]].dropna(subset=[bank_col])
+    df.columns = ["Bank Name", "Credit Cards Outstanding", "Debit Cards Outstanding"]
+    return df.reset_index(drop=True)
+
+def as_records(df):
+    """Rows as plain tuples, with every missing value as None"""
+    return [
+        tuple(None if pd.isna(value) else value for value in row)
+        for row in df.astype(object).itertuples(index=False)
+    ]
+
+def test_parse_excel_matches_legacy_parser(tmp_path):
+    path = tmp_path / "ATMJANUARY2024.xlsx"
+    write_workbook(path)
+    parser = RBIExcelParser(str(tmp_path))
+    assert as_records(parser.parse_excel(str(path))) == as_records(legacy_parse_excel(str(path)))
+
+def test_batches_keep_missing_cells_as_na(tmp_path):
+    write_workbook(tmp_path / "ATMJANUARY2024.xlsx")
+    parser = RBIExcelParser(str(tmp_path))
+    (df,) = parser.process_all_batches()
+    assert df["bank_name"].tolist() == ["State Bank", "Axis Bank", "HDFC Bank", "Total"]
+    assert str(df["credit_cards"].dtype) == "Int64"
+    assert df["credit_cards"].isna().tolist() == [False, False, True, False]
+    assert df["debit_cards"].isna().tolist() == [False, True, False, False]
+    assert df["month_str"].iloc[0] == "January-2024"
+    assert parser.file_records == {"ATMJANUARY2024.xlsx": 4}
+
+def test_batches_are_ordered_by_month_and_skip_unreadable_files(tmp_path):
+    write_workbook(tmp_path / "ATMMARCH2024.xlsx")
+    write_workbook(tmp_path / "ATMJANUARY2024.xlsx")
+    (tmp_path / "ATMFEBRUARY2024.xlsx").write_bytes(b"not a workbook")
+    parser = RBIExcelParser(str(tmp_path))
+    batches = parser.process_all_batches()
+    assert [df["month_str"].iloc[0] for df in batches] == ["January-2024", "March-2024"]
+    assert list(parser.file_errors) == ["ATMFEBRUARY2024.xlsx"]
+    assert "ATMFEBRUARY2024.xlsx" not in parser.file_months
+
+@pytest.mark.parametrize("file_name, supported", [
+    ("ATMJANUARY2024.xlsx", True),
+    ("ATMJANUARY2024.XLSX", True),
+    ("ATMJANUARY2010.xls", False),
+    ("notes.txt", False),
+])
+def test_is_supported_workbook(file_name, supported):
+    assert is_supported_workbook(file_name) == supported
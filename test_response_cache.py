@@ -0,0 +1,54 @@
+from flask import Flask, jsonify
+from dataset import DatasetStore
+from response_cache import ResponseCache
+
+def make_app(on_view=None):
+    """App with one cached view over a tracked DatasetStore; returns (client, store, cache, calls)"""
+    store = DatasetStore()
+    cache = ResponseCache()
+    cache.track(store)
+    calls = []
+    app = Flask(__name__)
+
+    @app.route('/rows')
+    @cache.cached(bank_type='All')
+    def rows():
+        calls.append(1)
+        if on_view:
+            on_view(store)
+        return jsonify({'version': store.current.version})
+
+    return app.test_client(), store, cache, calls
+
+def test_make_key_includes_version_and_fills_defaults():
+    params = {'bank_type': 'All', 'limit': 10}
+    key = ResponseCache.make_key('rows', params, {'limit': 5, 'unused': 1}, version=3)
+    assert key == ('rows', 3, ('bank_type', 'All'), ('limit', 5))
+    assert key != ResponseCache.make_key('rows', params, {'limit': 5}, version=4)
+
+def test_responses_are_cached_per_dataset_version():
+    client, store, cache, calls = make_app()
+    store.publish({})
+    assert client.get('/rows').json == {'version': 1}
+    assert client.get('/rows?bank_type=All').json == {'version': 1}
+    assert len(calls) == 1
+
+    # A new snapshot misses the old entry even before invalidate() runs
+    store.publish({})
+    assert client.get('/rows').json == {'version': 2}
+    assert len(calls) == 2
+    assert cache.stats()['hits'] == 1
+
+def test_response_is_not_stored_when_a_snapshot_is_published_mid_view():
+    published = []
+    def publish_once(store):
+        if not published:
+            published.append(store.publish({}))
+
+    client, store, cache, calls = make_app(on_view=publish_once)
+    store.publish({})
+    client.get('/rows')
+    assert cache.stats()['entries'] == 0
+    client.get('/rows')
+    client.get('/rows')
+    assert len(calls) == 2
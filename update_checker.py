@@ -1,12 +1,26 @@
 import os
 import time
+import atexit
+import threading
 import requests
 from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import logging
 from datetime import datetime
 import json
+import sqlite3
+from contextlib import contextmanager
+try:
+    import fcntl
+except ImportError:
+    # Not on Windows; listing cache saves there are merged but unlocked
+    fcntl = None
+from http_cache import HTTPCache
+from downloader import DownloadManager
+from parse_cache import file_sha256
+from excel_parser import RBIExcelParser, is_supported_workbook
+from stats_store import ensure_manifest, load_manifest, record_manifest, manifest_month
 
 # Configure logging
 logging.basicConfig(
@@ -19,22 +33,248 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+RBI_LISTING_URL = "https://www.rbi.org.in/Scripts/ATMView.aspx"
+
+# How long a fetched listing is reused; set RBI_LISTING_CACHE_FILE to share it across processes
+LISTING_TTL = int(os.environ.get("RBI_LISTING_TTL", 600))
+LISTING_CACHE_FILE = os.environ.get("RBI_LISTING_CACHE_FILE")
+
+def extract_excel_links(html_content):
+    """Return (full_url, filename) for every Excel link on the listing page"""
+    soup = BeautifulSoup(html_content, 'html.parser')
+    excel_links = []
+    for a in soup.find_all("a", href=True):
+        href = a["href"]
+        if href.lower().endswith((".xls", ".xlsx")):
+            full_url = href if href.startswith("http") else "https://www.rbi.org.in" + href
+            filename = full_url.split("/")[-1]
+            excel_links.append((full_url, filename))
+    return excel_links
+
+class SharedBrowser:
+    """
+    Long-lived headless Chromium, launched on first use and reused for every
+    fallback fetch. Playwright's sync API is bound to the thread that started
+    it, so all browser work runs on one dedicated thread
+    """
+    
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shared-browser")
+        self._playwright = None
+        self._browser = None
+    
+    def _get_content(self, url):
+        if self._browser is None:
+            from playwright.sync_api import sync_playwright
+            playwright = sync_playwright().start()
+            try:
+                self._browser = playwright.chromium.launch(headless=True)
+            except Exception:
+                playwright.stop()
+                raise
+            self._playwright = playwright
+            logger.info("Launched shared headless browser")
+        page = self._browser.new_page()
+        try:
+            page.goto(url)
+            page.wait_for_load_state("networkidle")
+            return page.content()
+        finally:
+            page.close()
+    
+    def get_content(self, url):
+        """Rendered HTML of url"""
+        return self._executor.submit(self._get_content, url).result()
+    
+    def _close(self):
+        if self._browser is not None:
+            self._browser.close()
+            self._playwright.stop()
+            self._browser = None
+            self._playwright = None
+    
+    def close(self):
+        if self._browser is None:
+            return
+        try:
+            self._executor.submit(self._close).result()
+            self._executor.shutdown()
+        except RuntimeError:
+            # Worker thread already stopped at interpreter exit; the
+            # Playwright driver process goes down with us
+            pass
+
+shared_browser = SharedBrowser()
+atexit.register(shared_browser.close)
+
+class ListingCache:
+    """
+    TTL cache of Excel listings keyed by page URL, shared in-process and
+    optionally persisted to a JSON file. Concurrent callers for the same
+    URL wait for a single fetch. Each save re-reads the file under a lock
+    and changes only its own URL, so processes sharing the file keep each
+    other's entries
+    """
+    
+    def __init__(self, ttl=LISTING_TTL, cache_file=None):
+        self.ttl = ttl
+        self.cache_file = cache_file
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._url_locks = {}
+        self._load()
+    
+    def _read_file(self):
+        if not os.path.exists(self.cache_file):
+            return {}
+        try:
+            with open(self.cache_file, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable listing cache: {str(e)}")
+            return {}
+    
+    def _load(self):
+        if self.cache_file:
+            self._entries = self._read_file()
+    
+    @contextmanager
+    def _file_lock(self):
+        """Cross-process lock around read-merge-write of the cache file"""
+        if fcntl is None:
+            yield
+            return
+        with open(self.cache_file + ".lock", 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def _save(self, url=None):
+        """
+        Write this process's entry for url (every entry when None) over the
+        current file contents, and pick up entries other processes saved
+        """
+        if not self.cache_file:
+            return
+        try:
+            with self._file_lock():
+                entries = self._read_file() if url is not None else {}
+                if url is None:
+                    entries.update(self._entries)
+                elif url in self._entries:
+                    entries[url] = self._entries[url]
+                else:
+                    entries.pop(url, None)
+                tmp_path = f"{self.cache_file}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w') as f:
+                    json.dump(entries, f)
+                os.replace(tmp_path, self.cache_file)
+            self._entries = entries
+        except Exception as e:
+            logger.warning(f"Could not save listing cache: {str(e)}")
+    
+    def _fresh(self, url):
+        entry = self._entries.get(url)
+        if entry and time.time() - entry['fetched_at'] < self.ttl:
+            return entry
+        return None
+    
+    def get(self, url, fetch):
+        """
+        Return (excel_links, info) for url, calling fetch(url) only when
+        there is no entry younger than the TTL
+        """
+        with self._lock:
+            url_lock = self._url_locks.setdefault(url, threading.Lock())
+        with url_lock:
+            with self._lock:
+                entry = self._fresh(url)
+            if entry:
+                info = dict(entry['info'], method='cache')
+                return [tuple(link) for link in entry['links']], info
+            
+            excel_links, info = fetch(url)
+            if excel_links:
+                with self._lock:
+                    self._entries[url] = {
+                        'links': excel_links,
+                        'info': info,
+                        'fetched_at': time.time()
+                    }
+                    self._save(url)
+            return excel_links, info
+    
+    def invalidate(self, url=None):
+        """Drop the cached listing for url, or every listing"""
+        with self._lock:
+            if url is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(url, None)
+            self._save(url)
+
+listing_cache = ListingCache(cache_file=LISTING_CACHE_FILE)
+
+def fetch_excel_listing(url=RBI_LISTING_URL, http_cache=None):
+    """
+    List Excel files on the RBI page with a plain HTTP fetch, falling back to
+    the shared browser only when that finds no links.
+    Returns (excel_links, info) where info records the path taken and its duration
+    """
+    start = time.perf_counter()
+    excel_links = []
+    method = "http"
+    try:
+        if http_cache:
+            response = http_cache.get(url)
+        else:
+            response = requests.get(url, timeout=30)
+            response.raise_for_status()
+        excel_links = extract_excel_links(response.text)
+    except Exception as e:
+        logger.warning(f"Plain HTTP listing failed: {str(e)}")
+    
+    if not excel_links:
+        method = "browser"
+        excel_links = extract_excel_links(shared_browser.get_content(url))
+    
+    info = {
+        'method': method,
+        'seconds': round(time.perf_counter() - start, 3),
+        'files': len(excel_links)
+    }
+    logger.info(f"Listed {info['files']} Excel files via {method} in {info['seconds']}s")
+    return excel_links, info
+
 class RBIUpdateChecker:
     """
     Class to check for updates on the RBI website and download new Excel files
     """
     
-    def __init__(self, excel_dir="RBI_ATM_Excel", status_file="update_status.json"):
+    def __init__(self, excel_dir="RBI_ATM_Excel", status_file="update_status.json", http_cache_dir="http_cache",
+                 db_path="rbi_card_stats.db"):
         """Initialize the update checker"""
         self.excel_dir = excel_dir
         self.status_file = status_file
-        self.base_url = "https://www.rbi.org.in/Scripts/ATMView.aspx"
+        self.db_path = db_path
+        self.base_url = RBI_LISTING_URL
+        
+        # Conditional-GET cache so unchanged files are not downloaded again
+        self.http_cache = HTTPCache(http_cache_dir)
         
         # Create Excel directory if it doesn't exist
         os.makedirs(self.excel_dir, exist_ok=True)
         
         # Load previous status
         self.status = self.load_status()
+        
+        # Known files live in the ingest manifest table
+        self.init_manifest()
+        
+        # file name -> source URL of every file the last download_new_files() fetched
+        self.downloaded_sources = {}
     
     def load_status(self):
         """Load update status from file"""
@@ -49,10 +289,43 @@ class RBIUpdateChecker:
         return {
             'last_checked': None,
             'last_updated': None,
-            'known_files': [],
             'new_data_available': False
         }
     
+    def init_manifest(self):
+        """Create the ingest manifest table if needed"""
+        conn = sqlite3.connect(self.db_path)
+        with conn:
+            ensure_manifest(conn)
+        conn.close()
+    
+    def get_known_urls(self, excel_links):
+        """
+        Source URLs already recorded in the ingest manifest. Files listed in a
+        status file from before the manifest are added to it first
+        """
+        conn = sqlite3.connect(self.db_path)
+        manifest = load_manifest(conn.cursor())
+        legacy_files = set(self.status.get('known_files', []))
+        if legacy_files:
+            parser = RBIExcelParser(self.excel_dir)
+            seeded = []
+            for url, filename in excel_links:
+                if filename not in legacy_files or url in manifest:
+                    continue
+                file_path = os.path.join(self.excel_dir, filename)
+                fingerprint = file_sha256(file_path) if os.path.exists(file_path) else ""
+                month = manifest_month(parser.extract_month_from_filename(filename))
+                seeded.append((url, month, False, fingerprint))
+            with conn:
+                record_manifest(conn, seeded)
+            manifest.update((url, (month, fingerprint)) for url, month, _, fingerprint in seeded)
+            logger.info(f"Seeded the ingest manifest with {len(seeded)} files from the status file")
+            # Saved without known_files from now on
+            self.status.pop('known_files')
+        conn.close()
+        return set(manifest)
+    
     def save_status(self):
         """Save update status to file"""
         try:
@@ -62,38 +335,25 @@ class RBIUpdateChecker:
         except Exception as e:
             logger.error(f"Error saving status file: {str(e)}")
     
-    def get_available_excel_files(self):
+    def get_available_excel_files(self, force=False):
         """Get list of Excel files available on the RBI website"""
         logger.info("Checking for available Excel files on RBI website")
         
         try:
-            # Use Playwright to access the RBI website
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                page = browser.new_page()
-                
-                # Navigate to the RBI page
-                page.goto(self.base_url)
-                page.wait_for_load_state("networkidle")
-                
-                # Get the page content
-                html_content = page.content()
-                browser.close()
-            
-            # Parse with BeautifulSoup
-            soup = BeautifulSoup(html_content, 'html.parser')
+            if force:
+                listing_cache.invalidate(self.base_url)
+            excel_links, info = listing_cache.get(
+                self.base_url, lambda url: fetch_excel_listing(url, self.http_cache)
+            )
+            self.status['last_listing'] = info
             
-            # Find all Excel download links
-            excel_links = []
-            for a in soup.find_all("a", href=True):
-                href = a["href"]
-                if href.lower().endswith((".xls", ".xlsx")):
-                    full_url = href if href.startswith("http") else "https://www.rbi.org.in" + href
-                    filename = full_url.split("/")[-1]
-                    excel_links.append((full_url, filename))
+            # Legacy .xls workbooks cannot be parsed; never download or wait on them
+            supported = [(url, filename) for url, filename in excel_links if is_supported_workbook(filename)]
+            if len(supported) < len(excel_links):
+                logger.info(f"Skipping {len(excel_links) - len(supported)} Excel files in unsupported formats")
             
-            logger.info(f"Found {len(excel_links)} Excel files on RBI website")
-            return excel_links
+            logger.info(f"Found {len(supported)} Excel files on RBI website")
+            return supported
         
         except Exception as e:
             logger.error(f"Error checking for available Excel files: {str(e)}")
@@ -115,8 +375,8 @@ class RBIUpdateChecker:
             return False
         
         # Check if there are new files
-        current_filenames = [filename for _, filename in excel_links]
-        new_files = [filename for filename in current_filenames if filename not in self.status['known_files']]
+        known_urls = self.get_known_urls(excel_links)
+        new_files = [filename for url, filename in excel_links if url not in known_urls]
         
         if new_files:
             logger.info(f"Found {len(new_files)} new Excel files")
@@ -140,26 +400,25 @@ class RBIUpdateChecker:
             return []
         
         # Filter for new files
-        current_filenames = [filename for _, filename in excel_links]
-        new_files = [(url, filename) for url, filename in excel_links if filename not in self.status['known_files']]
+        known_urls = self.get_known_urls(excel_links)
+        new_files = [(url, filename) for url, filename in excel_links if url not in known_urls]
         
-        # Download new files
+        # Download new files in parallel over one pooled session
+        jobs = [(url, os.path.join(self.excel_dir, filename)) for url, filename in new_files]
         downloaded_files = []
-        for url, filename in new_files:
-            logger.info(f"Downloading {filename}")
-            try:
-                r = requests.get(url)
-                r.raise_for_status()
-                file_path = os.path.join(self.excel_dir, filename)
-                with open(file_path, "wb") as f:
-                    f.write(r.content)
-                downloaded_files.append(file_path)
-                logger.info(f"Successfully downloaded {filename}")
-            except Exception as e:
-                logger.error(f"Error downloading {filename}: {str(e)}")
+        self.downloaded_sources = {}
+        with DownloadManager(self.http_cache) as manager:
+            for url, file_path, result, error in manager.download_all(jobs):
+                if error:
+                    continue
+                if not result.not_modified:
+                    downloaded_files.append(file_path)
+                self.downloaded_sources[os.path.basename(file_path)] = url
+        
+        self.status['last_download'] = manager.report
+        logger.info(f"HTTP cache: {self.http_cache.stats()}")
         
-        # Update status
-        self.status['known_files'] = current_filenames
+        # Files enter the manifest once they are ingested (see download_updates)
         self.status['last_updated'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         self.status['new_data_available'] = False
         self.save_status()
@@ -170,6 +429,10 @@ class RBIUpdateChecker:
         """Get current update status"""
         return self.status
 
+def invalidate_listing():
+    """Force the next check or download to fetch the RBI listing again"""
+    listing_cache.invalidate()
+
 def check_for_updates():
     """Function to check for updates on the RBI website"""
     checker = RBIUpdateChecker()
@@ -177,12 +440,16 @@ def check_for_updates():
     return checker.get_update_status()
 
 def download_updates():
-    """Function to download updates from the RBI website"""
+    """
+    Function to download updates from the RBI website. Pass the returned
+    sources (file name -> URL) to the ingest so it can record them in the manifest
+    """
     checker = RBIUpdateChecker()
     downloaded_files = checker.download_new_files()
     return {
         'status': checker.get_update_status(),
-        'downloaded_files': downloaded_files
+        'downloaded_files': downloaded_files,
+        'sources': checker.downloaded_sources
     }
 
 if __name__ == "__main__":